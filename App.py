@@ -14,25 +14,76 @@ import getpass
 import re
 import hashlib
 import configparser
+import time
 
 try:
-    from neo4j import GraphDatabase, exceptions as neo4j_exceptions
+    from neo4j import GraphDatabase, Query, exceptions as neo4j_exceptions
 except ImportError:
     print("Neo4j driver not found. Installing required packages...")
     import subprocess
     subprocess.check_call([sys.executable, "-m", "pip", "install", "neo4j"])
-    from neo4j import GraphDatabase, exceptions as neo4j_exceptions
+    from neo4j import GraphDatabase, Query, exceptions as neo4j_exceptions
 
-class Neo4jConnection:
-    """Handles connection and queries to Neo4j database."""
+from neo4j_client import DEFAULT_CACHE_SIZE, DEFAULT_POOL_SIZE, Neo4jConnection as BaseConnection, SessionPool
+from completion import UsernameCompleter
+from leaderboard import DEFAULT_MAX_STALENESS, DEFAULT_SIZE as DEFAULT_LEADERBOARD_SIZE, Leaderboard
+from recommendations import (DEFAULT_CACHE_TTL, DEFAULT_FANOUT, DEFAULT_MAX_AGE, DEFAULT_MAX_FOLLOWED, DEFAULT_TOP_N,
+                             RecommendationEngine)
+from snapshot import (DEFAULT_MAX_DEPTH as DEFAULT_PATH_MAX_DEPTH, DEFAULT_MAX_EXPANSIONS as DEFAULT_PATH_MAX_EXPANSIONS,
+                      SIMILARITY_METRICS, GraphSnapshot, mutual_counts_from_lists)
+from features import PROFILE_METRICS, FeatureIndex
 
-    def __init__(self, uri, user, password):
-        self.driver = None
+# Rows per page in the followers/following listings
+LISTING_PAGE_SIZE = 25
+
+# Seconds read results stay cached; writes through this client invalidate them sooner
+PROFILE_CACHE_TTL = 30
+LISTING_CACHE_TTL = 30
+
+# Full-text index over user names and usernames, used by search
+USER_SEARCH_INDEX = "userSearch"
+SEARCH_PAGE_SIZE = 10
+
+# Seconds a path search may run on the server before it's abandoned
+PATH_QUERY_TIMEOUT = 5.0
+
+# Shorter words are too noisy to match with edit distance
+FUZZY_MIN_LENGTH = 4
+
+def build_search_query(term):
+    """
+    Turn a free-text search term into a Lucene query for the user search index.
+
+    Every word must match, either exactly (ranked highest), as a prefix, or
+    for longer words within a small edit distance. Only word characters are
+    kept, so the result never contains Lucene syntax from the user's input.
+    """
+    clauses = []
+    for word in re.findall(r"\w+", term.lower()):
+        options = [f"{word}^3", f"{word}*"]
+        if len(word) >= FUZZY_MIN_LENGTH:
+            options.append(f"{word}~")
+        clauses.append("(" + " OR ".join(options) + ")")
+    return " AND ".join(clauses)
+
+def parse_positive_int(value):
+    """Return value as an int if it's a positive whole number, else None."""
+    return int(value) if value.isdigit() and int(value) > 0 else None
+
+class Neo4jConnection(BaseConnection):
+    """Handles connection and queries to Neo4j database.
+
+    Querying, pooling and caching come from ``neo4j_client``; this class only
+    keeps the CLI's shorter connection and error messages.
+    """
+
+    def _connect(self, password, pool_size):
         try:
-            self.driver = GraphDatabase.driver(uri, auth=(user, password))
+            self.driver = GraphDatabase.driver(self.uri, auth=(self.user, password))
             # Test the connection
             with self.driver.session() as session:
                 session.run("RETURN 1")
+            self.pool = SessionPool(self.driver, pool_size)
             print("Connected to Neo4j database")
         except neo4j_exceptions.ServiceUnavailable:
             print("Failed to connect to Neo4j database. Please check if Neo4j is running and credentials are correct.")
@@ -41,28 +92,8 @@ class Neo4jConnection:
             print(f"Error connecting to Neo4j: {e}")
             self.driver = None
 
-    def close(self):
-        """Close the driver connection."""
-        if self.driver:
-            self.driver.close()
-
-    def verify_connection(self):
-        """Verify if the connection to Neo4j is active."""
-        return self.driver is not None
-
-    def execute_query(self, query, parameters=None):
-        """Execute a Cypher query and return results."""
-        if not self.driver:
-            print("No connection to Neo4j database")
-            return None
-
-        try:
-            with self.driver.session() as session:
-                result = session.run(query, parameters or {})
-                return [record for record in result]
-        except Exception as e:
-            print(f"Query error: {e}")
-            return None
+    def _report_query_error(self, e):
+        print(f"Query error: {e}")
 
 class SocialNetworkCLI(cmd.Cmd):
     """Command-line interface for the Socli Network application."""
@@ -80,6 +111,11 @@ class SocialNetworkCLI(cmd.Cmd):
         super().__init__()
         self.connection = self._init_db_connection()
         self._setup_database()
+        self.leaderboard = self._init_leaderboard()
+        self.usernames = UsernameCompleter(self.connection)
+        self.recommender = self._init_recommender()
+        self.snapshot = None
+        self.features = None
 
     def _init_db_connection(self):
         """Initialize connection to Neo4j database."""
@@ -91,17 +127,23 @@ class SocialNetworkCLI(cmd.Cmd):
             uri = config.get('neo4j', 'uri', fallback='bolt://localhost:7687')
             user = config.get('neo4j', 'user', fallback='neo4j')
             password = config.get('neo4j', 'password', fallback='')
+            pool_size = config.getint('neo4j', 'pool_size', fallback=DEFAULT_POOL_SIZE)
+            cache_size = config.getint('neo4j', 'cache_size', fallback=DEFAULT_CACHE_SIZE)
         else:
             print("Neo4j database configuration not found.")
             uri = input("Enter Neo4j URI [bolt://localhost:7687]: ") or "bolt://localhost:7687"
             user = input("Enter Neo4j username [neo4j]: ") or "neo4j"
             password = getpass.getpass("Enter Neo4j password: ")
+            pool_size = DEFAULT_POOL_SIZE
+            cache_size = DEFAULT_CACHE_SIZE
 
             # Save configuration
             config['neo4j'] = {
                 'uri': uri,
                 'user': user,
-                'password': password
+                'password': password,
+                'pool_size': str(pool_size),
+                'cache_size': str(cache_size)
             }
 
             with open('config.ini', 'w') as configfile:
@@ -109,7 +151,28 @@ class SocialNetworkCLI(cmd.Cmd):
 
             print("Configuration saved to config.ini")
 
-        return Neo4jConnection(uri, user, password)
+        return Neo4jConnection(uri, user, password, pool_size, cache_size)
+
+    def _init_leaderboard(self):
+        """Create the popular users leaderboard, sized from config.ini when set."""
+        config = configparser.ConfigParser()
+        config.read('config.ini')
+        size = config.getint('leaderboard', 'size', fallback=DEFAULT_LEADERBOARD_SIZE)
+        max_staleness = config.getfloat('leaderboard', 'max_staleness', fallback=DEFAULT_MAX_STALENESS)
+        return Leaderboard(self.connection, size, max_staleness)
+
+    def _init_recommender(self):
+        """Create the recommendation engine, with expansion limits and cache TTL from config.ini when set."""
+        config = configparser.ConfigParser()
+        config.read('config.ini')
+        return RecommendationEngine(
+            self.connection,
+            top_n=config.getint('recommendations', 'top_n', fallback=DEFAULT_TOP_N),
+            max_followed=config.getint('recommendations', 'max_followed', fallback=DEFAULT_MAX_FOLLOWED),
+            fanout=config.getint('recommendations', 'fanout', fallback=DEFAULT_FANOUT),
+            max_age=config.getint('recommendations', 'max_age', fallback=DEFAULT_MAX_AGE),
+            cache_ttl=config.getint('recommendations', 'cache_ttl', fallback=DEFAULT_CACHE_TTL)
+        )
 
     def _setup_database(self):
         """Set up initial database constraints and indexes."""
@@ -119,12 +182,33 @@ class SocialNetworkCLI(cmd.Cmd):
         # Create constraints to ensure unique usernames and emails
         constraints = [
             "CREATE CONSTRAINT IF NOT EXISTS FOR (u:User) REQUIRE u.username IS UNIQUE",
-            "CREATE CONSTRAINT IF NOT EXISTS FOR (u:User) REQUIRE u.email IS UNIQUE"
+            "CREATE CONSTRAINT IF NOT EXISTS FOR (u:User) REQUIRE u.email IS UNIQUE",
+            "CREATE CONSTRAINT IF NOT EXISTS FOR (f:Feature) REQUIRE f.id IS UNIQUE",
+            "CREATE CONSTRAINT IF NOT EXISTS FOR (c:Circle) REQUIRE c.id IS UNIQUE",
+            # Lets popular read the top follower counts from the index
+            "CREATE INDEX IF NOT EXISTS FOR (u:User) ON (u.followerCount)",
+            # Lets username completion fetch only users who joined since its last refresh
+            "CREATE INDEX IF NOT EXISTS FOR (u:User) ON (u.joinDate)",
+            f"CREATE FULLTEXT INDEX {USER_SEARCH_INDEX} IF NOT EXISTS FOR (u:User) ON EACH [u.name, u.username]"
         ]
 
         for constraint in constraints:
             self.connection.execute_query(constraint)
 
+        # Users from before the follow counters existed get them from their
+        # degree, so popular and the leaderboard see them too
+        self.connection.execute_query(
+            """
+            MATCH (u:User)
+            WHERE u.followerCount IS NULL OR u.followingCount IS NULL
+            CALL {
+                WITH u
+                SET u.followerCount = COUNT { (u)<-[:FOLLOWS]-() },
+                    u.followingCount = COUNT { (u)-[:FOLLOWS]->() }
+            } IN TRANSACTIONS OF 1000 ROWS
+            """
+        )
+
 
     def do_register(self, arg):
         """Register a new user: register"""
@@ -191,7 +275,9 @@ class SocialNetworkCLI(cmd.Cmd):
             email: $email,
             password: $password,
             joinDate: datetime(),
-            bio: $bio
+            bio: $bio,
+            followerCount: 0,
+            followingCount: 0
         })
         RETURN u.username as username
         """
@@ -208,6 +294,9 @@ class SocialNetworkCLI(cmd.Cmd):
         )
 
         if result:
+            self.usernames.add(username)
+            # A cached lookup may still say this user doesn't exist
+            self.connection.invalidate_cache(f"user:{username}")
             print(f"\nUser '{username}' registered successfully! You can now login.")
         else:
             print("Failed to register user. Please try again.")
@@ -248,6 +337,20 @@ class SocialNetworkCLI(cmd.Cmd):
         else:
             print("Invalid username or password.")
 
+    def _complete_username(self, text, line, begidx, endidx):
+        """Complete the username argument of a command from the local username index."""
+        if not self.connection.verify_connection():
+            return []
+        return self.usernames.complete(text)
+
+    complete_follow = _complete_username
+    complete_unfollow = _complete_username
+    complete_profile = _complete_username
+    complete_mutuals = _complete_username
+    complete_similar = _complete_username
+    complete_similar_profile = _complete_username
+    complete_path = _complete_username
+
     def do_logout(self, arg):
         """Logout from your account."""
         if not self.current_user:
@@ -274,16 +377,26 @@ class SocialNetworkCLI(cmd.Cmd):
             print("Please login first or specify a username.")
             return
 
-        # Query user profile
+        # Query user profile and follow counts in a single round-trip. Users
+        # created before the counters existed fall back to the relationship
+        # degree, which Neo4j reads from the node without expanding the edges
         query = """
         MATCH (u:User {username: $username})
         RETURN u.username as username, u.name as name, u.email as email,
-               u.bio as bio, u.joinDate as joinDate
+               u.bio as bio, u.joinDate as joinDate,
+               CASE WHEN u.followerCount IS NULL
+                    THEN COUNT { (u)<-[:FOLLOWS]-() }
+                    ELSE u.followerCount END as followerCount,
+               CASE WHEN u.followingCount IS NULL
+                    THEN COUNT { (u)-[:FOLLOWS]->() }
+                    ELSE u.followingCount END as followingCount
         """
 
         result = self.connection.execute_query(
             query,
-            {"username": username}
+            {"username": username},
+            ttl=PROFILE_CACHE_TTL,
+            tags=(f"user:{username}",)
         )
 
         if not result or len(result) == 0:
@@ -306,33 +419,9 @@ class SocialNetworkCLI(cmd.Cmd):
         if user['joinDate']:
             print(f"Joined: {user['joinDate']}")
 
-        # Get follower count
-        followers_query = """
-        MATCH (follower:User)-[:FOLLOWS]->(u:User {username: $username})
-        RETURN count(follower) as followerCount
-        """
-
-        followers_result = self.connection.execute_query(
-            followers_query,
-            {"username": username}
-        )
-
-        if followers_result:
-            print(f"Followers: {followers_result[0]['followerCount']}")
-
-        # Get following count
-        following_query = """
-        MATCH (u:User {username: $username})-[:FOLLOWS]->(following:User)
-        RETURN count(following) as followingCount
-        """
-
-        following_result = self.connection.execute_query(
-            following_query,
-            {"username": username}
-        )
-
-        if following_result:
-            print(f"Following: {following_result[0]['followingCount']}")
+        # Counts are maintained on write by follow, unfollow and delete
+        print(f"Followers: {user['followerCount']}")
+        print(f"Following: {user['followingCount']}")
 
         print()
 
@@ -414,6 +503,9 @@ class SocialNetworkCLI(cmd.Cmd):
         )
 
         if update_result:
+            # The name shows up in other users' listings, so drop everything cached
+            self.connection.invalidate_cache()
+            self.leaderboard.invalidate()
             print("\nProfile updated successfully!")
         else:
             print("Failed to update profile.")
@@ -507,13 +599,31 @@ class SocialNetworkCLI(cmd.Cmd):
                 print("Cancelling user deletion")
                 return
 
+            # Release the counts held on the other end of every follow before
+            # deleting. Counters missing on older users are seeded from degree
             query = """
             MATCH (n: User {username: $username})
+            CALL {
+                WITH n
+                MATCH (n)-[r:FOLLOWS]->(f:User)
+                WITH f, count(r) AS edges
+                SET f.followerCount = coalesce(f.followerCount, COUNT { (f)<-[:FOLLOWS]-() }) - edges
+            }
+            CALL {
+                WITH n
+                MATCH (f:User)-[r:FOLLOWS]->(n)
+                WITH f, count(r) AS edges
+                SET f.followingCount = coalesce(f.followingCount, COUNT { (f)-[:FOLLOWS]->() }) - edges
+            }
             DETACH DELETE n
             """
 
             delete_result =  self.connection.execute_query(query, {"username": self.current_user})
             if delete_result is not None:
+                # Deleting a user changes the follower counts of everyone they followed
+                self.connection.invalidate_cache()
+                self.leaderboard.invalidate()
+                self.usernames.remove(self.current_user)
                 print(f"User {self.current_user} successfully deleted!")
                 self.current_user = None
                 self.prompt = "social> "
@@ -538,34 +648,40 @@ class SocialNetworkCLI(cmd.Cmd):
             print("You cannot follow yourself.")
             return
 
-        # Check existence
-        user_exists = self.connection.execute_query(
-            "MATCH (u:User {username: $username}) RETURN u", {"username": username}
-        )
-        if not user_exists:
-            print(f"User '{username}' not found.")
+        # Existence check, duplicate check and create happen in one statement.
+        # MERGE locks both users, so concurrent follows can't create the edge
+        # twice, and the counters only move when the edge is new. datetime()
+        # reads the statement clock, so since equals it only on a new edge.
+        # Counters missing on older users are seeded from degree, which
+        # already includes the new edge
+        query = """
+        MATCH (a:User {username: $me}), (b:User {username: $them})
+        MERGE (a)-[r:FOLLOWS]->(b)
+        ON CREATE SET
+            r.since = datetime(),
+            a.followingCount = coalesce(a.followingCount + 1, COUNT { (a)-[:FOLLOWS]->() }),
+            b.followerCount = coalesce(b.followerCount + 1, COUNT { (b)<-[:FOLLOWS]-() })
+        RETURN r.since = datetime() AS created, r.since AS since,
+               b.name AS name, b.followerCount AS followers
+        """
+        result = self.connection.execute_query(query, {"me": self.current_user, "them": username})
+
+        if result is None:
+            print(f"Failed to follow {username}.")
             return
 
-        # Check if already following
-        already = self.connection.execute_query(
-            """
-            MATCH (:User {username: $me})-[r:FOLLOWS]->(:User {username: $them})
-            RETURN r.since AS since
-            """,
-            {"me": self.current_user, "them": username}
-        )
+        if not result:
+            print(f"User '{username}' not found.")
+            return
 
-        if already:
-            since = already[0].get("since")
-            print(f"You're already following {username} since {since or 'earlier'}.")
+        row = result[0]
+        if not row["created"]:
+            print(f"You're already following {username} since {row['since'] or 'earlier'}.")
             return
 
-        # Follow
-        query = """
-        MATCH (a:User {username: $me}), (b:User {username: $them})
-        CREATE (a)-[:FOLLOWS {since: datetime()}]->(b)
-        """
-        self.connection.execute_query(query, {"me": self.current_user, "them": username})
+        self.connection.invalidate_cache(f"user:{self.current_user}", f"user:{username}")
+        self.leaderboard.record(username, row["name"], row["followers"])
+        self.recommender.mark_stale(self.current_user)
         print(f"You're now following {username}.")
         # By Siddhi Patil – UC-5
 
@@ -601,103 +717,526 @@ class SocialNetworkCLI(cmd.Cmd):
             print("Cancelled.")
             return
 
-        self.connection.execute_query(
+        result = self.connection.execute_query(
             """
-            MATCH (:User {username: $me})-[r:FOLLOWS]->(:User {username: $them})
-            DELETE r
+            MATCH (a:User {username: $me})-[r:FOLLOWS]->(b:User {username: $them})
+            WITH a, b, collect(r) AS rels
+            FOREACH (rel IN rels | DELETE rel)
+            SET a.followingCount = coalesce(a.followingCount - size(rels), COUNT { (a)-[:FOLLOWS]->() }),
+                b.followerCount = coalesce(b.followerCount - size(rels), COUNT { (b)<-[:FOLLOWS]-() })
+            RETURN b.name AS name, b.followerCount AS followers
             """,
             {"me": self.current_user, "them": username}
         )
+        if result:
+            self.connection.invalidate_cache(f"user:{self.current_user}", f"user:{username}")
+            self.leaderboard.record(username, result[0]["name"], result[0]["followers"])
+            self.recommender.mark_stale(self.current_user)
         print(f"You've unfollowed {username}.")
     # By Siddhi Patil – UC-6
 
+    def follow_users(self, me, usernames):
+        """
+        Follow many users in a single transaction.
+
+        Returns:
+            A dict with the 'followed', 'already' and 'missing' usernames, or
+            None if the query failed. `me` and repeated names are skipped.
+        """
+        usernames = [them for them in dict.fromkeys(usernames) if them != me]
+        outcome = {"followed": [], "already": [], "missing": []}
+        if not usernames:
+            return outcome
+
+        # As in follow, datetime() reads the statement clock, so an edge's
+        # since equals it only if this statement's MERGE created the edge.
+        # `me`'s counter is written once, after every row has been merged
+        result = self.connection.execute_query(
+            """
+            MATCH (a:User {username: $me})
+            UNWIND $usernames AS them
+            OPTIONAL MATCH (b:User {username: them})
+            FOREACH (_ IN CASE WHEN b IS NOT NULL THEN [1] ELSE [] END |
+                MERGE (a)-[r:FOLLOWS]->(b)
+                ON CREATE SET
+                    r.since = datetime(),
+                    b.followerCount = coalesce(b.followerCount + 1, COUNT { (b)<-[:FOLLOWS]-() })
+            )
+            WITH a, them, b
+            OPTIONAL MATCH (a)-[r:FOLLOWS]->(b)
+            WITH a, them, b, any(rel IN collect(r) WHERE rel.since = datetime()) AS created
+            WITH a, collect({them: them, found: b IS NOT NULL, created: created,
+                             name: b.name, followers: b.followerCount}) AS rows,
+                 sum(CASE WHEN created THEN 1 ELSE 0 END) AS added
+            SET a.followingCount = coalesce(a.followingCount + added, COUNT { (a)-[:FOLLOWS]->() })
+            WITH rows
+            UNWIND rows AS row
+            RETURN row.them AS them, row.found AS found, row.created AS created,
+                   row.name AS name, row.followers AS followers
+            """,
+            {"me": me, "usernames": usernames}
+        )
+
+        if result is None:
+            return None
+
+        for row in result:
+            if not row["found"]:
+                outcome["missing"].append(row["them"])
+            elif not row["created"]:
+                outcome["already"].append(row["them"])
+            else:
+                outcome["followed"].append(row["them"])
+                self.leaderboard.record(row["them"], row["name"], row["followers"])
+
+        if outcome["followed"]:
+            self.connection.invalidate_cache(f"user:{me}", *(f"user:{them}" for them in outcome["followed"]))
+            self.recommender.mark_stale(me)
+        return outcome
+
+    def unfollow_users(self, me, usernames):
+        """
+        Unfollow many users in a single transaction.
+
+        Returns:
+            A dict with the 'unfollowed', 'not_following' and 'missing'
+            usernames, or None if the query failed. `me` and repeated names
+            are skipped.
+        """
+        usernames = [them for them in dict.fromkeys(usernames) if them != me]
+        outcome = {"unfollowed": [], "not_following": [], "missing": []}
+        if not usernames:
+            return outcome
+
+        result = self.connection.execute_query(
+            """
+            MATCH (a:User {username: $me})
+            UNWIND $usernames AS them
+            OPTIONAL MATCH (b:User {username: them})
+            OPTIONAL MATCH (a)-[r:FOLLOWS]->(b)
+            WITH a, them, b, collect(r) AS rels
+            FOREACH (rel IN rels | DELETE rel)
+            FOREACH (_ IN CASE WHEN size(rels) > 0 THEN [1] ELSE [] END |
+                SET b.followerCount = coalesce(b.followerCount - size(rels), COUNT { (b)<-[:FOLLOWS]-() })
+            )
+            WITH a, collect({them: them, found: b IS NOT NULL, removed: size(rels) > 0,
+                             name: b.name, followers: b.followerCount}) AS rows,
+                 sum(size(rels)) AS removed
+            SET a.followingCount = coalesce(a.followingCount - removed, COUNT { (a)-[:FOLLOWS]->() })
+            WITH rows
+            UNWIND rows AS row
+            RETURN row.them AS them, row.found AS found, row.removed AS removed,
+                   row.name AS name, row.followers AS followers
+            """,
+            {"me": me, "usernames": usernames}
+        )
+
+        if result is None:
+            return None
+
+        for row in result:
+            if not row["found"]:
+                outcome["missing"].append(row["them"])
+            elif not row["removed"]:
+                outcome["not_following"].append(row["them"])
+            else:
+                outcome["unfollowed"].append(row["them"])
+                self.leaderboard.record(row["them"], row["name"], row["followers"])
+
+        if outcome["unfollowed"]:
+            self.connection.invalidate_cache(f"user:{me}", *(f"user:{them}" for them in outcome["unfollowed"]))
+            self.recommender.mark_stale(me)
+        return outcome
+
+    def _parse_username_list(self, arg):
+        """
+        Read usernames from a command argument: either names separated by
+        spaces or commas, or --file <path> with one or more names per line.
+        Returns the unique names in order, or None if the file can't be read.
+        """
+        arg = arg.strip()
+        if arg.startswith("--file"):
+            path = arg[len("--file"):].strip()
+            try:
+                with open(path, 'r') as f:
+                    lines = [line for line in f if not line.lstrip().startswith('#')]
+            except OSError as e:
+                print(f"Cannot read {path}: {e}")
+                return None
+            text = " ".join(lines)
+        else:
+            text = arg
+
+        # dict.fromkeys keeps the first occurrence of each name, in order
+        return list(dict.fromkeys(username for username in re.split(r"[\s,]+", text) if username))
+
+    def do_follow_many(self, arg):
+        """Follow several users at once: follow_many <user> [user ...] | follow_many --file <path>"""
+        if not self.connection.verify_connection():
+            print("Database connection is not available.")
+            return
+        if not self.current_user:
+            print("Please login first.")
+            return
+
+        usernames = self._parse_username_list(arg)
+        if usernames is None:
+            return
+        if self.current_user in usernames:
+            print("Skipping yourself.")
+            usernames.remove(self.current_user)
+        if not usernames:
+            print("Please specify usernames to follow.")
+            return
+
+        outcome = self.follow_users(self.current_user, usernames)
+        if outcome is None:
+            print("Failed to follow users.")
+            return
+
+        print(f"Followed {len(outcome['followed'])}, already following {len(outcome['already'])}, "
+              f"not found {len(outcome['missing'])}.")
+        if outcome["missing"]:
+            print(f"Not found: {', '.join(outcome['missing'])}")
+
+    def do_unfollow_many(self, arg):
+        """Unfollow several users at once: unfollow_many <user> [user ...] | unfollow_many --file <path>"""
+        if not self.connection.verify_connection():
+            print("Database connection is not available.")
+            return
+        if not self.current_user:
+            print("Please login first.")
+            return
+
+        usernames = self._parse_username_list(arg)
+        if usernames is None:
+            return
+        if not usernames:
+            print("Please specify usernames to unfollow.")
+            return
+
+        confirm = input(f"Unfollow {len(usernames)} users? Type 'yes' to confirm: ")
+        if confirm.lower() != 'yes':
+            print("Cancelled.")
+            return
+
+        outcome = self.unfollow_users(self.current_user, usernames)
+        if outcome is None:
+            print("Failed to unfollow users.")
+            return
+
+        print(f"Unfollowed {len(outcome['unfollowed'])}, not following {len(outcome['not_following'])}, "
+              f"not found {len(outcome['missing'])}.")
+        if outcome["missing"]:
+            print(f"Not found: {', '.join(outcome['missing'])}")
+
+    def _parse_args(self, arg, options, flags=()):
+        """
+        Split a command's arguments into (positional tokens, option values, flags set).
+
+        `options` maps each option that takes a value to a (parse, message)
+        pair; parse turns the value into the option's value, or returns None
+        when it's invalid, in which case message is printed. Returns None and
+        prints the problem if the arguments are invalid.
+        """
+        tokens = arg.split()
+        positional = []
+        values = {}
+        enabled = set()
+
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token in options:
+                if i + 1 >= len(tokens):
+                    print(f"{token} needs a value.")
+                    return None
+                parse, message = options[token]
+                value = parse(tokens[i + 1])
+                if value is None:
+                    print(message)
+                    return None
+                values[token] = value
+                i += 2
+            elif token in flags:
+                enabled.add(token)
+                i += 1
+            else:
+                positional.append(token)
+                i += 1
+
+        return positional, values, enabled
+
+    def _parse_listing_args(self, arg):
+        """
+        Split a listing command's arguments into (username, limit, after).
+        Returns None and prints the problem if they're invalid.
+        """
+        args = self._parse_args(arg, {
+            "--limit": (parse_positive_int, "--limit must be a positive number."),
+            "--after": (str, None),
+        })
+        if args is None:
+            return None
+
+        positional, values, _ = args
+        username = positional[-1] if positional else None
+        return username or self.current_user, values.get("--limit", LISTING_PAGE_SIZE), values.get("--after")
+
+    def _show_listing(self, query, username, limit, after, column, header, empty_message, command):
+        """
+        Print a listing page by page using keyset pagination.
+
+        Each page asks for the rows ordered after the last username shown,
+        so every page costs one bounded query however deep the listing goes.
+        """
+        number = 0
+        while True:
+            # Rows print as they arrive. One extra row tells whether another
+            # page follows; it's still read so the stream ends, which caches
+            # the page and returns its pooled session before the prompt
+            shown = 0
+            more = False
+            for row in self.connection.stream_query(
+                query,
+                {"username": username, "after": after, "limit": limit + 1},
+                ttl=LISTING_CACHE_TTL,
+                tags=(f"user:{username}",)
+            ):
+                if shown == limit:
+                    more = True
+                    continue
+                if not number:
+                    print(header)
+                number += 1
+                shown += 1
+                after = row[column]
+                print(f"{number}. {row[column]} ({row['name']})")
+
+            if not number:
+                print(empty_message)
+                return
+            if not more:
+                return
+
+            answer = input("-- more? [Enter for next page, q to stop] ").strip().lower()
+            if answer == "q":
+                print(f"Continue with: {command} {username} --limit {limit} --after {after}")
+                return
+
     def do_followers(self, arg):
-        """List users following you or another user: followers [username]"""
+        """List users following you or another user: followers [username] [--limit N] [--after USER]"""
         if not self.connection.verify_connection():
             print("Database connection is not available.")
             return
 
-        username = arg.strip() or self.current_user
+        args = self._parse_listing_args(arg)
+        if args is None:
+            return
+
+        username, limit, after = args
         if not username:
             print("Please login or specify a username.")
             return
 
-        result = self.connection.execute_query(
+        self._show_listing(
             """
             MATCH (f:User)-[:FOLLOWS]->(u:User {username: $username})
+            WHERE $after IS NULL OR f.username > $after
             RETURN f.username AS follower, f.name AS name
             ORDER BY follower
+            LIMIT $limit
             """,
-            {"username": username}
+            username, limit, after, "follower",
+            f"\nFollowers of {username}:",
+            f"No one follows {username}.",
+            "followers"
         )
-
-        if not result:
-            print(f"No one follows {username}.")
-            return
-
-        print(f"\nFollowers of {username}:")
-        for i, row in enumerate(result, 1):
-            print(f"{i}. {row['follower']} ({row['name']})")
     # By Siddhi Patil – UC-7A
 
 
     def do_following(self, arg):
-        """List users you or another user is following: following [username]"""
+        """List users you or another user is following: following [username] [--limit N] [--after USER]"""
         if not self.connection.verify_connection():
             print("Database connection is not available.")
             return
 
-        username = arg.strip() or self.current_user
+        args = self._parse_listing_args(arg)
+        if args is None:
+            return
+
+        username, limit, after = args
         if not username:
             print("Please login or specify a username.")
             return
 
-        result = self.connection.execute_query(
+        self._show_listing(
             """
             MATCH (u:User {username: $username})-[:FOLLOWS]->(f:User)
+            WHERE $after IS NULL OR f.username > $after
             RETURN f.username AS following, f.name AS name
             ORDER BY following
+            LIMIT $limit
             """,
-            {"username": username}
+            username, limit, after, "following",
+            f"\n{username} is following:",
+            f"{username} is not following anyone.",
+            "following"
         )
+    # By Siddhi Patil – UC-7B
+
+    def do_recommendations(self, arg):
+        """Show people you may know: recommendations [--local]"""
+        if not self.current_user:
+            print("Please login first.")
+            return
+
+        if arg.strip() == "--local":
+            snapshot = self._require_snapshot()
+            if not snapshot:
+                return
+            result = [{"username": username, "name": name, "score": score}
+                      for username, name, score in snapshot.recommendations(self.current_user) or []]
+        else:
+            if not self.connection.verify_connection():
+                print("Database connection is not available.")
+                return
+            result = self.recommender.get(self.current_user)
 
         if not result:
-            print(f"{username} is not following anyone.")
+            print("No recommendations available.")
             return
 
-        print(f"\n{username} is following:")
-        for i, row in enumerate(result, 1):
-            print(f"{i}. {row['following']} ({row['name']})")
-    # By Siddhi Patil – UC-7B
+        print("\nPeople You May Know:")
+        for i, rec in enumerate(result, 1):
+            label = f"{rec['username']} ({rec['name']})" if rec['name'] else rec['username']
+            print(f"{i}. {label} – {rec['score']} mutual connection(s)")
+    # By Siddhi Patil – UC-9
 
-    def do_recommendations(self, arg):
-        """Show people you may know: recommendations"""
+    def do_circles(self, arg):
+        """List the circles you or another user belong to: circles [username]"""
         if not self.connection.verify_connection():
             print("Database connection is not available.")
             return
-        if not self.current_user:
-            print("Please login first.")
+
+        username = arg.strip() or self.current_user
+        if not username:
+            print("Please login or specify a username.")
             return
 
         result = self.connection.execute_query(
             """
-            MATCH (me:User {username: $me})-[:FOLLOWS]->(:User)-[:FOLLOWS]->(rec:User)
-            WHERE rec.username <> $me AND NOT (me)-[:FOLLOWS]->(rec)
-            RETURN rec.username AS username, rec.name AS name, COUNT(*) AS mutuals
-            ORDER BY mutuals DESC, username
-            LIMIT 5
+            MATCH (u:User {username: $username})-[:MEMBER_OF]->(c:Circle)
+            RETURN c.name AS circle, c.owner AS owner, c.size AS size
+            ORDER BY owner, circle
             """,
-            {"me": self.current_user}
+            {"username": username}
         )
 
         if not result:
-            print("No recommendations available.")
+            print(f"{username} is not in any circles.")
             return
 
-        print("\nPeople You May Know:")
+        print(f"\nCircles {username} belongs to:")
         for i, row in enumerate(result, 1):
-            print(f"{i}. {row['username']} ({row['name']}) – {row['mutuals']} mutual connection(s)")
-    # By Siddhi Patil – UC-9
+            print(f"{i}. {row['circle']} of {row['owner']} ({row['size']} members)")
+        print()
+
+    def do_stats(self, arg):
+        """Show database connection statistics: stats"""
+        stats = self.connection.stats()
+        if not stats:
+            print("Database connection is not available.")
+            return
+
+        print("\n=== Connection Stats ===")
+        print(f"Session pool: {stats['open']}/{stats['size']} open, {stats['idle']} idle")
+        print(f"Acquisitions: {stats['acquisitions']}")
+        print(f"Wait time: avg {stats['avg_wait_ms']:.3f} ms, max {stats['max_wait_ms']:.3f} ms")
+
+        cache = self.connection.cache_stats()
+        print(f"Query cache: {cache['entries']}/{cache['max_entries']} entries, "
+              f"hit rate {cache['hit_rate']:.1%} ({cache['hits']} hits, {cache['misses']} misses)")
+        print(f"Evictions: {cache['evictions']}, invalidations: {cache['invalidations']}")
+        print()
+
+    def do_recount(self, arg):
+        """Recompute every user's follower and following counts: recount"""
+        if not self.connection.verify_connection():
+            print("Database connection is not available.")
+            return
+
+        # Runs in batches of its own transactions so large graphs don't build one huge transaction
+        query = """
+        MATCH (u:User)
+        CALL {
+            WITH u
+            SET u.followerCount = COUNT { (u)<-[:FOLLOWS]-() },
+                u.followingCount = COUNT { (u)-[:FOLLOWS]->() }
+        } IN TRANSACTIONS OF 1000 ROWS
+        """
+
+        print("Recounting followers and following for every user...")
+        if self.connection.execute_query(query) is None:
+            print("Failed to recount follows.")
+            return
+
+        self.connection.invalidate_cache()
+        self.leaderboard.invalidate()
+
+        result = self.connection.execute_query("MATCH (u:User) RETURN count(u) AS users")
+        print(f"Recounted follows for {result[0]['users'] if result else 0} users.")
+
+    def do_refresh_recommendations(self, arg):
+        """Recompute stored recommendations for every user: refresh_recommendations"""
+        if not self.connection.verify_connection():
+            print("Database connection is not available.")
+            return
+
+        print("Recomputing recommendations for every user...")
+        if not self.recommender.refresh_all():
+            print("Failed to refresh recommendations.")
+            return
+        print("Recommendations refreshed.")
+
+    def do_snapshot(self, arg):
+        """Take an in-memory snapshot of the follow graph: snapshot [--files <dataset_dir>]"""
+        tokens = arg.split()
+        if tokens and tokens[0] == "--files":
+            if len(tokens) != 2:
+                print("Usage: snapshot [--files <dataset_dir>]")
+                return
+            if not os.path.isdir(tokens[1]):
+                print(f"Dataset directory '{tokens[1]}' not found.")
+                return
+            build = lambda: (GraphSnapshot.from_dataset(tokens[1]), FeatureIndex.from_dataset(tokens[1]))
+        elif tokens:
+            print("Usage: snapshot [--files <dataset_dir>]")
+            return
+        else:
+            if not self.connection.verify_connection():
+                print("Database connection is not available.")
+                return
+            build = lambda: (GraphSnapshot.from_neo4j(self.connection), FeatureIndex.from_neo4j(self.connection))
+
+        start = time.perf_counter()
+        snapshot, features = build()
+        if snapshot is None or features is None:
+            print("Failed to take a snapshot.")
+            return
+
+        self.snapshot = snapshot
+        self.features = features
+        print(f"Snapshot of {len(snapshot)} users, {snapshot.edge_count} follows and profile features of "
+              f"{len(features)} users from {snapshot.source} taken in {(time.perf_counter() - start) * 1000:.0f} ms.")
+        print("Use --local with mutuals, recommendations or popular to query it.")
+
+    def _require_snapshot(self):
+        """Return the loaded snapshot, or print how to take one and return None."""
+        if self.snapshot is None:
+            print("No snapshot loaded. Run 'snapshot' first.")
+        return self.snapshot
+
     def do_clear(self, arg):
         """Clear the screen."""
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -724,12 +1263,19 @@ class SocialNetworkCLI(cmd.Cmd):
 
             print("\nGeneral Commands:")
             print("  clear           - Clear the screen")
+            print("  stats           - Show connection pool and cache statistics")
+            print("  recount         - Rebuild follower/following counts")
+            print("  refresh_recommendations - Recompute stored recommendations")
+            print("  snapshot        - Take an in-memory snapshot of the follow graph (--files <dir>)")
             print("  help            - Show this help message")
             print("  exit            - Exit the application")
 
             print("\nSearch & Exploration:")
-            print("  search [term]         - Search users by name or username")
-            print("  popular               - Explore the most followed users")
+            print("  search [term]         - Search users by name or username (--page N)")
+            print("  popular               - Explore the most followed users (--local)")
+            print("  circles [user]        - List the circles a user belongs to")
+            print("  similar [user]        - Find users who follow the same accounts (needs snapshot)")
+            print("  similar_profile [user]- Find users with matching profile features (needs snapshot)")
             print()
 
     def do_ls(self, arg):
@@ -752,9 +1298,15 @@ class SocialNetworkCLI(cmd.Cmd):
             print("\nSocli Interactions:")
             print("  follow <user>   - Follow another user")
             print("  unfollow <user> - Unfollow a user")
-            print("  followers [user]- List users following you or another user")
-            print("  following [user]- List users you or another user is following")
-            print("  recommendations - Get friend recommendations")
+            print("  follow_many     - Follow several users (names or --file <path>)")
+            print("  unfollow_many   - Unfollow several users (names or --file <path>)")
+            print("  followers [user]- List users following you or another user (--limit, --after)")
+            print("  following [user]- List users you or another user is following (--limit, --after)")
+            print("  recommendations - Get friend recommendations (--local)")
+            print("  mutuals <user>  - Show users you both follow (--local)")
+            print("  mutuals_matrix  - Count mutuals with many users (names, --file <path>, --local)")
+            print("  path <user>     - Show how you're connected to a user (--max-depth, --local)")
+            print("  circles [user]  - List the circles you or another user belong to")
 
             print("\nGeneral Commands:")
             print("  clear           - Clear the screen")
@@ -781,10 +1333,17 @@ class SocialNetworkCLI(cmd.Cmd):
         return self.do_exit(arg)
     
     def do_search(self, arg):
+        """Search users by name or username, best matches first: search <term> [--page N]"""
         if not self.connection.verify_connection():
             print("Database connection is not available.")
             return
 
+        page = 1
+        match = re.search(r"\s*--page\s+(\d+)\s*$", arg)
+        if match:
+            page = max(int(match.group(1)), 1)
+            arg = arg[:match.start()]
+
         term = arg.strip()
         if not term:
             term = input("Enter name or username to search: ").strip()
@@ -792,70 +1351,104 @@ class SocialNetworkCLI(cmd.Cmd):
             print("Search term cannot be empty.")
             return
 
-        query = """
-        MATCH (u:User)
-        WHERE toLower(u.name) CONTAINS toLower($term) OR toLower(u.username) CONTAINS toLower($term)
-        RETURN u.username AS username, u.name AS name
-        ORDER BY u.username
-        LIMIT 10
+        search_query = build_search_query(term)
+        if not search_query:
+            print("No matching users found.")
+            return
+
+        query = f"""
+        CALL db.index.fulltext.queryNodes('{USER_SEARCH_INDEX}', $search,
+                                          {{skip: $skip, limit: $limit}})
+        YIELD node, score
+        RETURN node.username AS username, node.name AS name, score
         """
 
-        result = self.connection.execute_query(query, {"term": term})
+        # Fetch one extra row to know whether another page exists
+        result = self.connection.execute_query(query, {
+            "search": search_query,
+            "skip": (page - 1) * SEARCH_PAGE_SIZE,
+            "limit": SEARCH_PAGE_SIZE + 1
+        })
 
         if not result:
             print("No matching users found.")
             return
 
-        print("\n=== Search Results ===")
-        for i, user in enumerate(result, 1):
+        print(f"\n=== Search Results (page {page}) ===")
+        offset = (page - 1) * SEARCH_PAGE_SIZE
+        for i, user in enumerate(result[:SEARCH_PAGE_SIZE], offset + 1):
             print(f"{i}. {user['username']} ({user['name']})")
+
+        if len(result) > SEARCH_PAGE_SIZE:
+            print(f"More results: search {term} --page {page + 1}")
         print()
 
     def do_popular(self, arg):
-        """Explore popular users (most followed): popular"""
-        if not self.connection.verify_connection():
-            print("Database connection is not available.")
-            return
+        """Explore popular users (most followed): popular [--local]"""
+        if arg.strip() == "--local":
+            snapshot = self._require_snapshot()
+            if not snapshot:
+                return
+            result = snapshot.popular(self.leaderboard.size)
+        else:
+            if not self.connection.verify_connection():
+                print("Database connection is not available.")
+                return
 
-        query = """
-        MATCH (u:User)<-[:FOLLOWS]-(f:User)
-        RETURN u.username AS username, u.name AS name, count(f) AS followers
-        ORDER BY followers DESC
-        LIMIT 10
-        """
+            # Served from the leaderboard, which only reloads when stale
+            result = self.leaderboard.top()
 
-        result = self.connection.execute_query(query)
+        if result is None:
+            print("Failed to retrieve popular users.")
+            return
 
         if not result:
-            print("Failed to retrieve popular users.")
+            print("No one has any followers yet.")
             return
 
         print("\n=== Most Followed Users ===")
-        for i, user in enumerate(result, 1):
-            print(f"{i}. {user['username']} ({user['name']}) - {user['followers']} followers")
+        for i, (username, name, followers) in enumerate(result, 1):
+            label = f"{username} ({name})" if name else username
+            print(f"{i}. {label} - {followers} followers")
         print()
     
 
 
     def do_mutuals(self, arg):
-        """Find mutual connections between you and another user: mutuals <username>"""
-        if not self.connection.verify_connection():
-            print("Database connection is not available.")
-            return
-
+        """Find mutual connections between you and another user: mutuals <username> [--local]"""
         if not self.current_user:
             print("Please login first.")
             return
 
-        other_username = arg.strip()
-        if not other_username:
-            print("Usage: mutuals <username>")
+        tokens = arg.split()
+        local = "--local" in tokens
+        if local:
+            tokens.remove("--local")
+
+        if len(tokens) != 1:
+            print("Usage: mutuals <username> [--local]")
             return
+        other_username = tokens[0]
 
         if other_username == self.current_user:
             print("Cannot check mutuals with yourself.")
             return
 
+        if local:
+            snapshot = self._require_snapshot()
+            if not snapshot:
+                return
+            mutuals = snapshot.mutuals(self.current_user, other_username)
+            if mutuals is None:
+                print(f"User '{other_username}' is not in the snapshot.")
+                return
+            self._print_mutuals(other_username, mutuals)
+            return
+
+        if not self.connection.verify_connection():
+            print("Database connection is not available.")
+            return
+
         query = """
         MATCH (me:User {username: $user1})-[:FOLLOWS]->(x)<-[:FOLLOWS]-(other:User {username: $user2})
         RETURN DISTINCT x.username AS mutual_friend
@@ -870,15 +1463,237 @@ class SocialNetworkCLI(cmd.Cmd):
             print("Failed to retrieve mutuals.")
             return
 
-        if not result:
+        self._print_mutuals(other_username, [r['mutual_friend'] for r in result])
+
+    def _print_mutuals(self, other_username, mutuals):
+        """Print the usernames two users both follow."""
+        if not mutuals:
             print(f"No mutuals found with {other_username}.")
         else:
             print(f"\n=== Mutuals with {other_username} ===")
-            for i, r in enumerate(result, 1):
-                print(f"{i}. {r['mutual_friend']}")
+            for i, username in enumerate(mutuals, 1):
+                print(f"{i}. {username}")
             print()
 
 
+    def do_mutuals_matrix(self, arg):
+        """Count mutuals between you and many users: mutuals_matrix <user> [user ...] | --file <path> [--local]"""
+        if not self.current_user:
+            print("Please login first.")
+            return
+
+        tokens = arg.split()
+        local = "--local" in tokens
+        if local:
+            tokens.remove("--local")
+
+        others = self._parse_username_list(" ".join(tokens))
+        if others is None:
+            return
+        if self.current_user in others:
+            others.remove(self.current_user)
+
+        if local:
+            snapshot = self._require_snapshot()
+            if not snapshot:
+                return
+            if snapshot.position(self.current_user) is None:
+                print("You are not in the snapshot.")
+                return
+
+            if not others:
+                # Rank everyone in the snapshot in the same pass
+                rows = [(username, count) for username, _, count
+                        in snapshot.top_mutuals(self.current_user, LISTING_PAGE_SIZE)]
+                missing = []
+            else:
+                counts = snapshot.mutual_counts(self.current_user, others)
+                rows = [(other, int(count)) for other, count in zip(others, counts) if other in snapshot.index]
+                missing = [other for other in others if other not in snapshot.index]
+        else:
+            if not others:
+                print("Usage: mutuals_matrix <user> [user ...] | --file <path> [--local]")
+                return
+            if not self.connection.verify_connection():
+                print("Database connection is not available.")
+                return
+
+            # Every following list in one round-trip, intersected locally
+            result = self.connection.execute_query(
+                """
+                UNWIND $usernames AS name
+                MATCH (u:User {username: name})
+                RETURN u.username AS username, [(u)-[:FOLLOWS]->(v:User) | v.username] AS following
+                """,
+                {"usernames": [self.current_user] + others}
+            )
+            if result is None:
+                print("Failed to retrieve mutuals.")
+                return
+
+            following = {row["username"]: row["following"] for row in result}
+            if self.current_user not in following:
+                print("Your account was not found.")
+                return
+            found = [other for other in others if other in following]
+            counts = mutual_counts_from_lists(following[self.current_user], [following[other] for other in found])
+            rows = list(zip(found, counts.tolist()))
+            missing = [other for other in others if other not in following]
+
+        if not rows:
+            print("No mutuals found.")
+        else:
+            rows.sort(key=lambda row: (-row[1], row[0]))
+            width = max(len(username) for username, _ in rows)
+            print(f"\n=== Mutuals with {len(rows)} user(s) ===")
+            for username, count in rows:
+                print(f"  {username:<{width}}  {count}")
+            print()
+        if missing:
+            print(f"Not found: {', '.join(missing)}")
+
+    def _parse_similarity_args(self, arg, metrics, flags=()):
+        """
+        Split a similarity command's arguments into (username, metric, limit, flags set).
+        Returns None and prints the problem if they're invalid.
+        """
+        args = self._parse_args(arg, {
+            "--metric": (lambda value: value if value in metrics else None,
+                         f"--metric must be one of: {', '.join(metrics)}."),
+            "--limit": (parse_positive_int, "--limit must be a positive number."),
+        }, flags)
+        if args is None:
+            return None
+
+        positional, values, enabled = args
+        username = (positional[-1] if positional else None) or self.current_user
+        if not username:
+            print("Please login or specify a username.")
+            return None
+        return username, values.get("--metric", metrics[0]), values.get("--limit", SEARCH_PAGE_SIZE), enabled
+
+    def _print_similar(self, header, result):
+        """Print ranked (username, name, score) tuples."""
+        print(f"\n=== {header} ===")
+        for i, (other, name, score) in enumerate(result, 1):
+            label = f"{other} ({name})" if name else other
+            print(f"{i}. {label} - {score:.3f}" if isinstance(score, float) else f"{i}. {label} - {score}")
+        print()
+
+    def do_similar(self, arg):
+        """Find users who follow the same accounts: similar [username] [--metric jaccard|adamic-adar] [--limit N]"""
+        args = self._parse_similarity_args(arg, SIMILARITY_METRICS)
+        if not args:
+            return
+        username, metric, limit, _ = args
+
+        snapshot = self._require_snapshot()
+        if not snapshot:
+            return
+
+        result = snapshot.similar(username, metric, limit)
+        if result is None:
+            print(f"User '{username}' is not in the snapshot.")
+            return
+        if not result:
+            print(f"No users similar to {username} found.")
+            return
+
+        self._print_similar(f"Users similar to {username} ({metric})", result)
+
+    def do_similar_profile(self, arg):
+        """Find users with matching profile features: similar_profile [username] [--metric cosine|hamming] [--limit N] [--exact]"""
+        args = self._parse_similarity_args(arg, PROFILE_METRICS, flags=("--exact",))
+        if not args:
+            return
+        username, metric, limit, flags = args
+
+        if self._require_snapshot() is None:
+            return
+
+        result = self.features.similar(username, metric, limit, exact="--exact" in flags)
+        if result is None:
+            print(f"{username} has no profile features in the snapshot.")
+            return
+        if not result:
+            print(f"No users with profiles like {username} found.")
+            return
+
+        self._print_similar(f"Profiles like {username} ({metric})", result)
+
+    def do_path(self, arg):
+        """Show how you're connected to a user: path <username> [--max-depth N] [--max-expansions N] [--local]"""
+        if not self.current_user:
+            print("Please login first.")
+            return
+
+        args = self._parse_args(arg, {
+            "--max-depth": (parse_positive_int, "--max-depth must be a positive number."),
+            "--max-expansions": (parse_positive_int, "--max-expansions must be a positive number."),
+        }, flags=("--local",))
+        if args is None:
+            return
+
+        positional, values, flags = args
+        username = positional[-1] if positional else None
+        max_depth = values.get("--max-depth", DEFAULT_PATH_MAX_DEPTH)
+        max_expansions = values.get("--max-expansions", DEFAULT_PATH_MAX_EXPANSIONS)
+        local = "--local" in flags
+
+        if not username:
+            print("Usage: path <username> [--max-depth N] [--max-expansions N] [--local]")
+            return
+        if username == self.current_user:
+            print("That's you.")
+            return
+
+        if local:
+            snapshot = self._require_snapshot()
+            if not snapshot:
+                return
+            for name in (self.current_user, username):
+                if snapshot.position(name) is None:
+                    print(f"User '{name}' is not in the snapshot.")
+                    return
+            path, exhausted = snapshot.shortest_path(self.current_user, username, max_depth, max_expansions)
+            if exhausted:
+                print(f"Gave up after scanning {max_expansions} connections; try a larger --max-expansions.")
+                return
+        else:
+            if not self.connection.verify_connection():
+                print("Database connection is not available.")
+                return
+
+            # Variable-length bounds can't be parameters; max_depth is a validated int.
+            # The timeout stands in for the expansion budget on the server
+            result = self.connection.execute_query(
+                Query(
+                    f"""
+                    MATCH (me:User {{username: $me}}), (them:User {{username: $them}})
+                    OPTIONAL MATCH p = shortestPath((me)-[:FOLLOWS*..{max_depth}]->(them))
+                    RETURN [n IN nodes(p) | n.username] AS path
+                    """,
+                    timeout=PATH_QUERY_TIMEOUT
+                ),
+                {"me": self.current_user, "them": username}
+            )
+            if result is None:
+                print("Failed to search for a path.")
+                return
+            if not result:
+                print(f"User '{username}' not found.")
+                return
+            path = result[0]["path"]
+
+        if not path:
+            print(f"No connection to {username} within {max_depth} hops.")
+            return
+
+        hops = len(path) - 1
+        print(f"\nYou are {hops} hop{'s' if hops != 1 else ''} from {username}:")
+        print("  " + " -> ".join(path))
+        print()
+
     def do_debug_mutual_pairs(self, arg):
         """Temporary: Show sample users with mutual follows."""
         query = """
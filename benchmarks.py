@@ -0,0 +1,225 @@
+"""
+Micro-benchmarks for the Social Network Application.
+
+Usage:
+    python benchmarks.py parsers [dataset_directory] [--repeat N]
+    python benchmarks.py profile <username> [--iterations N]
+    python benchmarks.py snapshot <username> <other_username> [--iterations N]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+import dataimporter
+from snapshot import GraphSnapshot
+
+
+def time_call(func, *args, repeat: int = 5) -> float:
+    """Return the best wall-clock time in seconds over `repeat` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_parsers(dataset_dir: str, repeat: int):
+    """Compare the line-by-line .edges parser with the vectorized loaders."""
+    dataset_path = Path(dataset_dir)
+
+    print("=== .edges parsing ===")
+    for name in ("1912.edges", "107.edges"):
+        file_path = str(dataset_path / name)
+
+        baseline = dataimporter.parse_edges_file(file_path)
+        fast = dataimporter.load_edges_array(file_path)
+        if not np.array_equal(np.array(baseline, dtype=fast.dtype).reshape(-1, 2), fast):
+            print(f"{name}: parsers disagree!")
+            sys.exit(1)
+
+        slow_time = time_call(dataimporter.parse_edges_file, file_path, repeat=repeat)
+        fast_time = time_call(dataimporter.load_edges_array, file_path, repeat=repeat)
+        print(f"{name:>12}: {len(fast):>6} edges | parse_edges_file {slow_time * 1000:8.2f} ms | "
+              f"load_edges_array {fast_time * 1000:7.2f} ms | {slow_time / fast_time:5.1f}x")
+
+    print("\n=== .feat / .egofeat parsing ===")
+    for name in ("1912", "107"):
+        feat_path = str(dataset_path / f"{name}.feat")
+        egofeat_path = str(dataset_path / f"{name}.egofeat")
+
+        ids, features = dataimporter.load_feat_array(feat_path)
+        feat_time = time_call(dataimporter.load_feat_array, feat_path, repeat=repeat)
+        egofeat_time = time_call(dataimporter.load_egofeat_array, egofeat_path, repeat=repeat)
+        print(f"{name:>12}: {features.shape[0]:>6} x {features.shape[1]} features | "
+              f"load_feat_array {feat_time * 1000:7.2f} ms | "
+              f"load_egofeat_array {egofeat_time * 1000:5.2f} ms")
+
+def latency_summary(samples) -> str:
+    """Format mean/p50/p95 of a list of durations in seconds as milliseconds."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (f"mean {statistics.mean(ordered) * 1000:7.2f} ms | "
+            f"p50 {statistics.median(ordered) * 1000:7.2f} ms | "
+            f"p95 {p95 * 1000:7.2f} ms")
+
+def legacy_profile(driver, username: str):
+    """The original profile command: three queries, each on a fresh session."""
+    queries = [
+        """
+        MATCH (u:User {username: $username})
+        RETURN u.username as username, u.name as name, u.email as email,
+               u.bio as bio, u.joinDate as joinDate
+        """,
+        """
+        MATCH (follower:User)-[:FOLLOWS]->(u:User {username: $username})
+        RETURN count(follower) as followerCount
+        """,
+        """
+        MATCH (u:User {username: $username})-[:FOLLOWS]->(following:User)
+        RETURN count(following) as followingCount
+        """,
+    ]
+    for query in queries:
+        with driver.session() as session:
+            list(session.run(query, {"username": username}))
+
+def bench_profile(username: str, iterations: int):
+    """Compare per-command latency of the original and current profile command against the configured Neo4j."""
+    from App import SocialNetworkCLI
+
+    cli = SocialNetworkCLI()
+    if not cli.connection.verify_connection():
+        print("Failed to connect to Neo4j database.")
+        sys.exit(1)
+
+    def current_profile():
+        # Time the real command; its output isn't part of the comparison
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli.do_profile(username)
+
+    # Warm up the driver's connection pool and the query caches on the server
+    legacy_profile(cli.connection.driver, username)
+    current_profile()
+
+    legacy_samples = []
+    current_samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        legacy_profile(cli.connection.driver, username)
+        legacy_samples.append(time.perf_counter() - start)
+
+        # profile reads through the query cache; measure the round-trip, not a cache hit
+        cli.connection.invalidate_cache()
+        start = time.perf_counter()
+        current_profile()
+        current_samples.append(time.perf_counter() - start)
+
+    print(f"=== profile {username} ({iterations} iterations) ===")
+    print(f"  3 queries, 3 sessions: {latency_summary(legacy_samples)}")
+    print(f"  1 query, pooled:       {latency_summary(current_samples)}")
+    print(f"  speedup (p50):         {statistics.median(legacy_samples) / statistics.median(current_samples):.1f}x")
+
+    cli.connection.close()
+
+SNAPSHOT_CYPHER = {
+    "mutuals": """
+        MATCH (me:User {username: $me})-[:FOLLOWS]->(x)<-[:FOLLOWS]-(other:User {username: $other})
+        RETURN DISTINCT x.username AS username
+        """,
+    "recommendations": """
+        MATCH (me:User {username: $me})-[:FOLLOWS]->(:User)-[:FOLLOWS]->(rec:User)
+        WHERE rec.username <> $me AND NOT (me)-[:FOLLOWS]->(rec)
+        RETURN rec.username AS username, COUNT(*) AS mutuals
+        ORDER BY mutuals DESC, username
+        LIMIT 5
+        """,
+    "popular": """
+        MATCH (u:User)
+        WHERE u.followerCount > 0
+        RETURN u.username AS username, u.followerCount AS followers
+        ORDER BY followers DESC, username
+        LIMIT 10
+        """,
+}
+
+def bench_snapshot(username: str, other: str, iterations: int):
+    """Compare graph queries answered by Cypher with the same answers from an in-process snapshot."""
+    from App import SocialNetworkCLI
+
+    cli = SocialNetworkCLI()
+    if not cli.connection.verify_connection():
+        print("Failed to connect to Neo4j database.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    graph = GraphSnapshot.from_neo4j(cli.connection)
+    if graph is None:
+        print("Failed to export the graph.")
+        sys.exit(1)
+    print(f"Snapshot of {len(graph)} users, {graph.edge_count} follows taken in "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    params = {"me": username, "other": other}
+    local = {
+        "mutuals": lambda: graph.mutuals(username, other) or [],
+        "recommendations": lambda: [rec[0] for rec in graph.recommendations(username) or []],
+        "popular": lambda: [rec[0] for rec in graph.popular(10)],
+    }
+
+    for name, query in SNAPSHOT_CYPHER.items():
+        expected = [row["username"] for row in cli.connection.execute_query(query, params) or []]
+        actual = local[name]()
+        if sorted(expected) != sorted(actual):
+            # popular's ties and followerCount drift can reorder results; report rather than fail
+            print(f"  {name}: results differ (cypher {expected}, snapshot {actual})")
+
+        cypher_samples = []
+        local_samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            cli.connection.execute_query(query, params)
+            cypher_samples.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            local[name]()
+            local_samples.append(time.perf_counter() - start)
+
+        print(f"=== {name} ({iterations} iterations) ===")
+        print(f"  cypher:   {latency_summary(cypher_samples)}")
+        print(f"  snapshot: {latency_summary(local_samples)}")
+        print(f"  speedup (p50): {statistics.median(cypher_samples) / statistics.median(local_samples):.1f}x")
+
+    cli.connection.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run micro-benchmarks.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    parsers_cmd = subparsers.add_parser("parsers", help="Compare dataset file parsers")
+    parsers_cmd.add_argument("dataset_dir", nargs="?", default="facebook")
+    parsers_cmd.add_argument("--repeat", type=int, default=5)
+
+    profile_cmd = subparsers.add_parser("profile", help="Compare profile command latency against Neo4j")
+    profile_cmd.add_argument("username")
+    profile_cmd.add_argument("--iterations", type=int, default=200)
+
+    snapshot_cmd = subparsers.add_parser("snapshot", help="Compare Cypher graph queries with the in-process snapshot")
+    snapshot_cmd.add_argument("username")
+    snapshot_cmd.add_argument("other_username")
+    snapshot_cmd.add_argument("--iterations", type=int, default=200)
+
+    args = parser.parse_args()
+
+    if args.benchmark == "parsers":
+        bench_parsers(args.dataset_dir, args.repeat)
+    elif args.benchmark == "profile":
+        bench_profile(args.username, args.iterations)
+    elif args.benchmark == "snapshot":
+        bench_snapshot(args.username, args.other_username, args.iterations)
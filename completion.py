@@ -0,0 +1,94 @@
+"""
+Username autocompletion for the CLI.
+
+Completions are served from an in-process sorted list of usernames, so a
+keystroke never waits on a database round-trip.
+"""
+
+import bisect
+import sys
+import threading
+import time
+
+REFRESH_INTERVAL = 30.0
+MAX_COMPLETIONS = 100
+
+
+class UsernameCompleter:
+    """
+    Completes usernames with a binary search over a sorted list.
+
+    The list is loaded on first use. After that, at most once every
+    `refresh_interval` seconds, only users who joined since the newest one
+    already loaded are fetched and merged in. Users registered or deleted
+    through this client are applied immediately.
+    """
+
+    def __init__(self, connection, refresh_interval=REFRESH_INTERVAL):
+        self.connection = connection
+        self.refresh_interval = refresh_interval
+        self._usernames = []
+        self._latest_join = None
+        self._loaded = False
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def complete(self, prefix):
+        """Return up to MAX_COMPLETIONS usernames starting with `prefix`, in order."""
+        with self._lock:
+            if self._checked_at is None or time.monotonic() - self._checked_at > self.refresh_interval:
+                self._refresh()
+
+            start = bisect.bisect_left(self._usernames, prefix)
+            end = bisect.bisect_left(self._usernames, prefix + chr(sys.maxunicode), lo=start)
+            return self._usernames[start:min(end, start + MAX_COMPLETIONS)]
+
+    def add(self, username):
+        """Make a newly registered username completable."""
+        with self._lock:
+            index = bisect.bisect_left(self._usernames, username)
+            if index == len(self._usernames) or self._usernames[index] != username:
+                self._usernames.insert(index, username)
+
+    def remove(self, username):
+        """Stop completing a deleted username."""
+        with self._lock:
+            index = bisect.bisect_left(self._usernames, username)
+            if index < len(self._usernames) and self._usernames[index] == username:
+                del self._usernames[index]
+
+    def _refresh(self):
+        self._checked_at = time.monotonic()
+        if not self.connection.verify_connection():
+            return
+
+        if not self._loaded:
+            result = self.connection.execute_query(
+                "MATCH (u:User) RETURN u.username AS username, u.joinDate AS joinDate"
+            )
+        else:
+            # >= so users sharing the latest timestamp aren't missed; duplicates are merged away
+            result = self.connection.execute_query(
+                """
+                MATCH (u:User)
+                WHERE u.joinDate >= $since
+                RETURN u.username AS username, u.joinDate AS joinDate
+                """,
+                {"since": self._latest_join}
+            )
+
+        if result is None:
+            return
+
+        join_dates = [row["joinDate"] for row in result if row["joinDate"] is not None]
+        if join_dates:
+            newest = max(join_dates)
+            if self._latest_join is None or newest > self._latest_join:
+                self._latest_join = newest
+
+        usernames = [row["username"] for row in result if row["username"]]
+        if not self._loaded:
+            self._usernames = sorted(set(usernames))
+            self._loaded = True
+        elif usernames:
+            self._usernames = sorted(set(self._usernames).union(usernames))
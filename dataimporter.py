@@ -5,16 +5,37 @@ This script imports Stanford's Facebook dataset into a Neo4j database
 for use with the Social Network Application.
 
 Usage:
-    python import_facebook_data.py <dataset_directory>
+    python dataimporter.py <dataset_directory> [--workers N] [--batch-size N]
+    python dataimporter.py <dataset_directory> --csv-out <output_directory>
 """
 
+import argparse
+import csv
+import json
 import os
 import sys
+import queue
 import random
 import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+import numpy as np
+
+from neo4j_client import SessionPool
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_WORKERS = 4
+DEFAULT_PASSWORD = "password123"
+DEFAULT_JOURNAL = "import_journal.json"
+
+# Facebook ids fit comfortably in 32 bits; edges are stored as (N, 2) arrays of this type
+ID_DTYPE = np.uint32
+
 
 def generate_random_name() -> str:
     """Generate a random name for a user."""
@@ -42,6 +63,46 @@ def parse_edges_file(file_path: str) -> List[Tuple[int, int]]:
             edges.append((source, target))
     return edges
 
+def load_edges_array(file_path: str) -> np.ndarray:
+    """Parse an .edges file in one vectorized pass into an (N, 2) array of (source, target) ids."""
+    return np.fromfile(file_path, dtype=ID_DTYPE, sep=" ").reshape(-1, 2)
+
+def load_feat_array(file_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse a .feat file in one vectorized pass.
+
+    Returns:
+        A tuple of (user_ids, features) where features is an (N, F) array of 0/1 flags
+    """
+    with open(file_path, 'r') as f:
+        columns = len(f.readline().split())
+
+    values = np.fromfile(file_path, dtype=ID_DTYPE, sep=" ")
+    if columns == 0:
+        return np.empty(0, dtype=ID_DTYPE), np.empty((0, 0), dtype=np.uint8)
+
+    rows = values.reshape(-1, columns)
+    return rows[:, 0].copy(), rows[:, 1:].astype(np.uint8)
+
+def load_egofeat_array(file_path: str) -> np.ndarray:
+    """Parse an .egofeat file into a 1-D array of the ego user's 0/1 feature flags."""
+    return np.fromfile(file_path, dtype=np.uint8, sep=" ")
+
+def parse_featnames_file(file_path: str) -> List[Tuple[int, str]]:
+    """
+    Parse a .featnames file into (feature_id, category) pairs indexed by column.
+
+    Column numbers are local to one ego network, but the trailing
+    "anonymized feature N" id is shared across the whole dataset.
+    """
+    featnames = []
+    with open(file_path, 'r') as f:
+        for line in f:
+            _, name = line.strip().split(' ', 1)
+            category, _, feature_id = name.rpartition(';anonymized feature ')
+            featnames.append((int(feature_id), category))
+    return featnames
+
 def parse_circles_file(file_path: str) -> Dict[str, List[int]]:
     """Parse a .circles file and return a dictionary of circle_name -> [user_ids]."""
     circles = {}
@@ -56,12 +117,475 @@ def parse_circles_file(file_path: str) -> Dict[str, List[int]]:
                 circles[circle_name] = user_ids
     return circles
 
-def import_facebook_data(dataset_dir: str):
+def hash_network_files(edges_file: Path) -> str:
+    """Return a SHA-256 digest over an ego network's .edges file and its companion files."""
+    digest = hashlib.sha256()
+    for suffix in ('.edges', '.feat', '.egofeat', '.featnames', '.circles'):
+        path = edges_file.with_suffix(suffix)
+        if path.exists():
+            digest.update(suffix.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+class ImportJournal:
+    """
+    Records import progress on disk so an interrupted import can resume.
+
+    The journal keeps the content hash of every ego network that was fully
+    imported, and for the run in progress, the batches each phase has
+    committed. Committed batches are only reused while the run fingerprint
+    (input files and batch size) is unchanged. Batch commits are appended
+    to a line log next to the journal, so recording one costs a single
+    short write however far the import has got.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.log_path = self.path.with_suffix(self.path.suffix + '.log')
+        self._lock = threading.Lock()
+        self.data = {"files": {}, "fingerprint": None, "phases": {}}
+
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self.data.update(json.load(f))
+
+        if self.data["fingerprint"] is not None and self.log_path.exists():
+            with open(self.log_path, 'r') as f:
+                for line in f:
+                    # A crash can leave the last line half written; that batch is simply redone
+                    if not line.endswith('\n'):
+                        break
+                    phase, _, index = line[:-1].rpartition('\t')
+                    if phase and index.isdigit():
+                        self.data["phases"].setdefault(phase, []).append(int(index))
+
+    def is_imported(self, edges_file: Path, digest: str) -> bool:
+        """Return True if this exact version of the ego network was already imported."""
+        return self.data["files"].get(edges_file.name) == digest
+
+    def begin(self, fingerprint: str):
+        """Start or resume a run; progress from a run over different inputs is discarded."""
+        with self._lock:
+            if self.data["fingerprint"] != fingerprint:
+                # Clear the old run's batches before the new fingerprint can claim them
+                self.log_path.unlink(missing_ok=True)
+                self.data["fingerprint"] = fingerprint
+                self.data["phases"] = {}
+                self._save()
+
+    def committed_batches(self, phase: str) -> set:
+        """Return the indexes of batches already committed for a phase."""
+        with self._lock:
+            return set(self.data["phases"].get(phase, []))
+
+    def commit_batch(self, phase: str, index: int):
+        """Record that a batch's transaction has committed."""
+        with self._lock:
+            self.data["phases"].setdefault(phase, []).append(index)
+            with open(self.log_path, 'a') as f:
+                f.write(f"{phase}\t{index}\n")
+
+    def finish(self, file_digests: Dict[str, str]):
+        """Mark the run's ego networks as imported and clear batch progress."""
+        with self._lock:
+            self.data["files"].update(file_digests)
+            self.data["fingerprint"] = None
+            self.data["phases"] = {}
+            self._save()
+            self.log_path.unlink(missing_ok=True)
+
+    def _save(self):
+        # Write to a temporary file first so a crash never leaves a truncated journal.
+        # Batch progress lives in the log, so only the digests and fingerprint are written
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({"files": self.data["files"], "fingerprint": self.data["fingerprint"]}, f)
+        os.replace(tmp_path, self.path)
+
+def list_edges_files(dataset_dir: str) -> List[Path]:
+    """Return the .edges files in the dataset directory, sorted; empty if there are none."""
+    return sorted(Path(dataset_dir).glob("*.edges"))
+
+def find_edges_files(dataset_dir: str) -> List[Path]:
+    """Return the .edges files in the dataset directory, exiting if there are none."""
+    edges_files = list_edges_files(dataset_dir)
+
+    if not edges_files:
+        print(f"No .edges files found in {dataset_dir}")
+        sys.exit(1)
+
+    print(f"Found {len(edges_files)} network files.")
+    return edges_files
+
+def load_network(edges_files: List[Path], verbose: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse every .edges file and return (user_ids, edges) across all ego networks.
+
+    user_ids is a sorted array of unique ids, including the ego users; edges
+    is an (N, 2) array of (source, target) rows, which takes a fraction of
+    the memory of a list of tuples. Progress is printed unless `verbose` is
+    False.
+    """
+    ego_ids = []
+    edge_chunks = []
+
+    for edges_file in edges_files:
+        ego_ids.append(int(edges_file.stem.split('.')[0]))
+
+        # Parse the edges file
+        edges = load_edges_array(str(edges_file))
+        edge_chunks.append(edges)
+
+        if verbose:
+            print(f"Processed {edges_file.name}: {len(edges)} connections")
+
+    total_edges = np.concatenate(edge_chunks) if edge_chunks else np.empty((0, 2), dtype=ID_DTYPE)
+    total_users = np.union1d(np.array(ego_ids, dtype=ID_DTYPE), total_edges.ravel())
+
+    if verbose:
+        print(f"Total unique users: {len(total_users)}")
+        print(f"Total connections: {len(total_edges)}")
+    return total_users, total_edges
+
+def load_features(edges_files: List[Path]) -> Tuple[Dict[int, str], Dict[int, List[int]]]:
+    """
+    Collect profile features from the .feat, .egofeat and .featnames files
+    alongside each .edges file.
+
+    Returns:
+        A tuple of (feature_categories, user_features) where feature_categories
+        maps dataset-wide feature ids to their category and user_features maps
+        each user id to the sorted ids of the features set for them
+    """
+    feature_categories = {}
+    user_features = {}
+
+    for edges_file in edges_files:
+        featnames_file = edges_file.with_suffix('.featnames')
+        feat_file = edges_file.with_suffix('.feat')
+        if not featnames_file.exists() or not feat_file.exists():
+            continue
+
+        featnames = parse_featnames_file(str(featnames_file))
+        feature_categories.update(featnames)
+
+        # Translate this ego network's column numbers to dataset-wide feature ids
+        column_ids = np.array([feature_id for feature_id, _ in featnames], dtype=ID_DTYPE)
+
+        user_ids, features = load_feat_array(str(feat_file))
+        rows = [(user_ids, features)]
+
+        egofeat_file = edges_file.with_suffix('.egofeat')
+        if egofeat_file.exists():
+            ego_user_id = int(edges_file.stem.split('.')[0])
+            ego_features = load_egofeat_array(str(egofeat_file)).reshape(1, -1)
+            rows.append((np.array([ego_user_id], dtype=ID_DTYPE), ego_features))
+
+        # A user can appear in several ego networks, so merge their feature sets
+        for ids, flags in rows:
+            for user_id, row in zip(ids.tolist(), flags):
+                user_features.setdefault(user_id, set()).update(column_ids[np.flatnonzero(row)].tolist())
+
+    return feature_categories, {user_id: sorted(ids) for user_id, ids in user_features.items()}
+
+def load_circles(edges_files: List[Path]) -> Tuple[List[Dict], List[Tuple[int, str]]]:
+    """
+    Collect the circles defined in the .circles file alongside each .edges file.
+
+    Circle names repeat across ego networks, so each circle is identified by
+    "<ego id>:<circle name>".
+
+    Returns:
+        A tuple of (circles, memberships) where circles holds the properties of
+        each Circle node and memberships holds (user_id, circle_id) pairs
+    """
+    circles = []
+    memberships = []
+
+    for edges_file in edges_files:
+        circles_file = edges_file.with_suffix('.circles')
+        if not circles_file.exists():
+            continue
+
+        ego_user_id = int(edges_file.stem.split('.')[0])
+        for circle_name, user_ids in parse_circles_file(str(circles_file)).items():
+            circle_id = f"{ego_user_id}:{circle_name}"
+            members = sorted(set(user_ids))
+            circles.append({
+                "id": circle_id,
+                "name": circle_name,
+                "owner": f"fb{ego_user_id}",
+                "size": len(members)
+            })
+            memberships.extend((user_id, circle_id) for user_id in members)
+
+    return circles, memberships
+
+def dedupe_edges(edges: np.ndarray) -> np.ndarray:
+    """Drop repeated (source, target) rows and return the edges sorted by source."""
+    # Pack each pair into one 64-bit key so dedup and sort are a single np.unique
+    keys = (edges[:, 0].astype(np.uint64) << np.uint64(32)) | edges[:, 1].astype(np.uint64)
+    keys = np.unique(keys)
+    return np.column_stack((
+        (keys >> np.uint64(32)).astype(ID_DTYPE),
+        (keys & np.uint64(0xFFFFFFFF)).astype(ID_DTYPE),
+    ))
+
+def build_user_record(user_id: int, hashed_password: str) -> Dict:
+    """Build the property map for an imported user."""
+    return {
+        "username": f"fb{user_id}",
+        "name": generate_random_name(),
+        "email": generate_email(user_id),
+        "password": hashed_password,
+        "bio": f"Imported Facebook user (ID: {user_id})",
+        "user_id": user_id  # Store the original Facebook ID for relationship mapping
+    }
+
+def export_admin_csv(dataset_dir: str, output_dir: str):
+    """
+    Convert the dataset into CSV files for `neo4j-admin database import`.
+
+    Writes separate header and data files for User nodes (keyed by username
+    in the User id space) and deduplicated FOLLOWS relationships, then prints
+    the import command to run against a stopped, empty database.
+
+    Args:
+        dataset_dir: Path to the directory containing the Facebook dataset
+        output_dir: Directory the CSV files are written to
+    """
+    edges_files = find_edges_files(dataset_dir)
+    total_users, total_edges = load_network(edges_files)
+
+    out_path = Path(output_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    hashed_password = hashlib.sha256(DEFAULT_PASSWORD.encode()).hexdigest()
+    imported_at = datetime.now(timezone.utc).isoformat()
+
+    feature_categories, user_features = load_features(edges_files)
+
+    # The same pair can appear in several overlapping ego networks
+    unique_edges = dedupe_edges(total_edges)
+
+    # Degree counts are precomputed so the loaded graph starts with correct counters.
+    # Ids are sparse, so count by position in total_users rather than by id
+    positions = np.searchsorted(total_users, unique_edges)
+    follower_counts = np.bincount(positions[:, 1], minlength=len(total_users))
+    following_counts = np.bincount(positions[:, 0], minlength=len(total_users))
+
+    with open(out_path / "users_header.csv", "w", newline="") as f:
+        csv.writer(f).writerow([
+            "username:ID(User)", "name", "email", "password", "bio",
+            "facebook_id:long", "joinDate:datetime", "features:int[]",
+            "followerCount:int", "followingCount:int"
+        ])
+
+    with open(out_path / "users.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        for position, user_id in enumerate(total_users.tolist()):
+            user = build_user_record(user_id, hashed_password)
+            writer.writerow([
+                user["username"], user["name"], user["email"], user["password"],
+                user["bio"], user["user_id"], imported_at,
+                ";".join(map(str, user_features.get(user_id, []))),
+                follower_counts[position], following_counts[position]
+            ])
+
+    with open(out_path / "features_header.csv", "w", newline="") as f:
+        csv.writer(f).writerow([":ID(Feature)", "id:int", "category"])
+
+    with open(out_path / "features.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        for feature_id, category in sorted(feature_categories.items()):
+            writer.writerow([feature_id, feature_id, category])
+
+    circles, memberships = load_circles(edges_files)
+
+    with open(out_path / "circles_header.csv", "w", newline="") as f:
+        csv.writer(f).writerow([":ID(Circle)", "id", "name", "owner", "size:int"])
+
+    with open(out_path / "circles.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        for circle in circles:
+            writer.writerow([circle["id"], circle["id"], circle["name"], circle["owner"], circle["size"]])
+
+    # Circles can list users that have no connections and therefore no User node
+    known_users = set(total_users.tolist())
+    memberships = [(user_id, circle_id) for user_id, circle_id in memberships if user_id in known_users]
+
+    with open(out_path / "member_of_header.csv", "w", newline="") as f:
+        csv.writer(f).writerow([":START_ID(User)", ":END_ID(Circle)"])
+
+    with open(out_path / "member_of.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        for user_id, circle_id in memberships:
+            writer.writerow([f"fb{user_id}", circle_id])
+
+    with open(out_path / "follows_header.csv", "w", newline="") as f:
+        csv.writer(f).writerow([":START_ID(User)", ":END_ID(User)", "since:datetime"])
+
+    with open(out_path / "follows.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        for source, target in unique_edges.tolist():
+            writer.writerow([f"fb{source}", f"fb{target}", imported_at])
+
+    print(f"\nWrote {len(total_users)} users, {len(feature_categories)} features, "
+          f"{len(circles)} circles ({len(memberships)} members) and "
+          f"{len(unique_edges)} follows relationships "
+          f"({len(total_edges) - len(unique_edges)} duplicates dropped) to {out_path}")
+    print("\nStop Neo4j, then load the files into an empty database with:")
+    print(f"  neo4j-admin database import full "
+          f"--nodes=User={out_path / 'users_header.csv'},{out_path / 'users.csv'} "
+          f"--nodes=Feature={out_path / 'features_header.csv'},{out_path / 'features.csv'} "
+          f"--nodes=Circle={out_path / 'circles_header.csv'},{out_path / 'circles.csv'} "
+          f"--relationships=MEMBER_OF={out_path / 'member_of_header.csv'},{out_path / 'member_of.csv'} "
+          f"--relationships=FOLLOWS={out_path / 'follows_header.csv'},{out_path / 'follows.csv'} "
+          f"neo4j")
+    print("\nStart Neo4j and launch App.py once to create the constraints.")
+    print(f"Default password for all imported users: '{DEFAULT_PASSWORD}'")
+
+def remove_duplicate_follows(connection) -> int:
+    """
+    Collapse parallel FOLLOWS relationships left behind by earlier imports.
+
+    The oldest relationship of each pair is kept so `since` stays meaningful.
+    Follower and following counters that were set are decremented by the
+    number of duplicates removed; unset counters are left for `recount`.
+
+    Returns:
+        The number of relationships deleted
+    """
+    # One source user per row, in batches of their own transactions, so
+    # large graphs don't build one huge transaction. Sources without
+    # duplicates return no row from the subquery
+    query = """
+    MATCH (a:User)
+    CALL {
+        WITH a
+        MATCH (a)-[r:FOLLOWS]->(b:User)
+        WITH a, b, r ORDER BY r.since
+        WITH a, b, collect(r) AS rels
+        WHERE size(rels) > 1
+        WITH a, b, tail(rels) AS duplicates
+        FOREACH (duplicate IN duplicates | DELETE duplicate)
+        SET b.followerCount = b.followerCount - size(duplicates)
+        WITH a, sum(size(duplicates)) AS removed
+        SET a.followingCount = a.followingCount - removed
+        RETURN removed
+    } IN TRANSACTIONS OF 1000 ROWS
+    RETURN sum(removed) AS removed
+    """
+    result = connection.execute_query(query)
+    return result[0]["removed"] if result else 0
+
+def _write_batch(tx, query: str, param_name: str, batch: List[Dict], attempts: List[int]) -> int:
+    """Transaction function for one batch; counts invocations so retries can be reported."""
+    attempts[0] += 1
+    record = tx.run(query, {param_name: batch}).single()
+    return record["created_count"] if record else 0
+
+def _import_worker(worker_id: int, pool: SessionPool, query: str, param_name: str,
+                   batches: "queue.Queue", total_batches: int, label: str,
+                   print_lock: threading.Lock, journal: "ImportJournal" = None) -> Dict:
+    """Drain batches from the shared queue on a single session and return throughput stats."""
+    stats = {"worker": worker_id, "batches": 0, "rows": 0, "retries": 0, "failed": 0}
+    start = time.perf_counter()
+
+    with pool.session() as session:
+        while True:
+            try:
+                index, batch = batches.get_nowait()
+            except queue.Empty:
+                break
+
+            # execute_write retries transient failures such as deadlocks between
+            # workers writing relationships that share an endpoint
+            attempts = [0]
+            try:
+                created = session.execute_write(_write_batch, query, param_name, batch, attempts)
+            except Exception as e:
+                stats["failed"] += 1
+                with print_lock:
+                    print(f"[worker {worker_id}] Failed {label} batch {index + 1}/{total_batches}: {e}")
+                continue
+            finally:
+                stats["retries"] += max(attempts[0] - 1, 0)
+
+            if journal:
+                journal.commit_batch(label, index)
+
+            stats["batches"] += 1
+            stats["rows"] += len(batch)
+            with print_lock:
+                print(f"[worker {worker_id}] Imported {label} batch {index + 1}/{total_batches}: {created} processed")
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+def import_batches_parallel(connection, query: str, param_name: str, batches: List[List[Dict]],
+                            workers: int, label: str, journal: ImportJournal = None) -> List[Dict]:
+    """
+    Write batches concurrently, each worker holding its own session.
+
+    Workers pull batches from a shared queue, so a slow batch never stalls
+    the others. Per-worker throughput is printed once all batches are done.
+    With a journal, batches already committed for this phase are skipped and
+    newly committed ones are recorded.
+
+    Returns:
+        A list of per-worker stats dictionaries
+    """
+    committed = journal.committed_batches(label) if journal else set()
+    if committed:
+        print(f"Resuming {label}: {len(committed)}/{len(batches)} batches already committed")
+
+    batch_queue = queue.Queue()
+    for index, batch in enumerate(batches):
+        if index not in committed:
+            batch_queue.put((index, batch))
+
+    workers = max(1, min(workers, batch_queue.qsize()))
+    pool = SessionPool(connection.driver, workers)
+    print_lock = threading.Lock()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_import_worker, worker_id, pool, query, param_name,
+                                batch_queue, len(batches), label, print_lock, journal)
+                for worker_id in range(1, workers + 1)
+            ]
+            results = [future.result() for future in futures]
+    finally:
+        pool.close()
+
+    for stats in results:
+        rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+        print(f"  worker {stats['worker']}: {stats['rows']} {label} in {stats['batches']} batches, "
+              f"{stats['seconds']:.2f}s ({rate:.0f} rows/s), "
+              f"{stats['retries']} retries, {stats['failed']} failed batches")
+
+    return results
+
+def import_facebook_data(dataset_dir: str, workers: int = DEFAULT_WORKERS,
+                         batch_size: int = DEFAULT_BATCH_SIZE, dedupe_existing: bool = False,
+                         journal_path: str = DEFAULT_JOURNAL):
     """
     Import Facebook data from the Stanford dataset into Neo4j.
 
+    Users and relationships are merged on their keys, so rerunning the import
+    against an already populated database writes nothing new. Progress is
+    checkpointed to a journal: an interrupted import resumes after the last
+    committed batches, and ego networks whose files are unchanged since a
+    completed import are skipped.
+
     Args:
         dataset_dir: Path to the directory containing the Facebook dataset
+        workers: Number of concurrent sessions used to write batches
+        batch_size: Number of rows sent per transaction
+        dedupe_existing: Remove duplicate FOLLOWS relationships created by older imports first
+        journal_path: Path of the progress journal
     """
     # Connect to Neo4j
     connection = None
@@ -77,132 +601,250 @@ def import_facebook_data(dataset_dir: str):
         print("Failed to connect to Neo4j database.")
         sys.exit(1)
 
-    dataset_path = Path(dataset_dir)
-    edges_files = list(dataset_path.glob("*.edges"))
+    edges_files = find_edges_files(dataset_dir)
+    all_edges_files = edges_files
+
+    # Skip ego networks that were already imported with identical content
+    journal = ImportJournal(journal_path)
+    file_digests = {}
+    for edges_file in edges_files:
+        digest = hash_network_files(edges_file)
+        if journal.is_imported(edges_file, digest):
+            print(f"Skipping {edges_file.name}: already imported")
+        else:
+            file_digests[edges_file.name] = digest
+    edges_files = [edges_file for edges_file in edges_files if edges_file.name in file_digests]
 
     if not edges_files:
-        print(f"No .edges files found in {dataset_dir}")
-        sys.exit(1)
+        print("All network files are already imported.")
+        connection.close()
+        return
 
-    print(f"Found {len(edges_files)} network files.")
+    fingerprint = hashlib.sha256(
+        json.dumps([sorted(file_digests.items()), batch_size]).encode()
+    ).hexdigest()
+    journal.begin(fingerprint)
 
     # Create constraints if they don't exist (similar to the App.py setup)
     print("Ensuring database constraints...")
     constraints = [
         "CREATE CONSTRAINT IF NOT EXISTS FOR (u:User) REQUIRE u.username IS UNIQUE",
-        "CREATE CONSTRAINT IF NOT EXISTS FOR (u:User) REQUIRE u.email IS UNIQUE"
+        "CREATE CONSTRAINT IF NOT EXISTS FOR (u:User) REQUIRE u.email IS UNIQUE",
+        "CREATE CONSTRAINT IF NOT EXISTS FOR (f:Feature) REQUIRE f.id IS UNIQUE",
+        "CREATE CONSTRAINT IF NOT EXISTS FOR (c:Circle) REQUIRE c.id IS UNIQUE",
+        "CREATE INDEX IF NOT EXISTS FOR (u:User) ON (u.followerCount)"
     ]
 
     for constraint in constraints:
         connection.execute_query(constraint)
 
-    # Process each .edges file
-    total_users = set()
-    total_edges = []
+    if dedupe_existing:
+        print("Removing duplicate follows relationships...")
+        print(f"Removed {remove_duplicate_follows(connection)} duplicate relationships")
 
-    for edges_file in edges_files:
-        ego_user_id = int(edges_file.stem.split('.')[0])
-        total_users.add(ego_user_id)
-
-        # Parse the edges file
-        edges = parse_edges_file(str(edges_file))
-        for source, target in edges:
-            total_users.add(source)
-            total_users.add(target)
-            total_edges.append((source, target))
-
-        print(f"Processed {edges_file.name}: {len(edges)} connections")
-
-    print(f"Total unique users: {len(total_users)}")
-    print(f"Total connections: {len(total_edges)}")
+    total_users, total_edges = load_network(edges_files)
 
     # Import users in batches
-    print("Importing users...")
-    batch_size = 500
-    user_list = list(total_users)
+    print(f"Importing users with {workers} workers...")
+    user_list = total_users.tolist()
 
     # Generate a default password for all imported users
-    default_password = "password123"
-    hashed_password = hashlib.sha256(default_password.encode()).hexdigest()
+    hashed_password = hashlib.sha256(DEFAULT_PASSWORD.encode()).hexdigest()
 
+    user_batches = []
     for i in range(0, len(user_list), batch_size):
         batch = user_list[i:i+batch_size]
+        user_batches.append([build_user_record(user_id, hashed_password) for user_id in batch])
+
+    # Create users
+    query = """
+    UNWIND $users AS user
+    MERGE (u:User {username: user.username})
+    ON CREATE SET
+        u.name = user.name,
+        u.email = user.email,
+        u.password = user.password,
+        u.bio = user.bio,
+        u.joinDate = datetime(),
+        u.facebook_id = user.user_id,
+        u.followerCount = 0,
+        u.followingCount = 0
+    RETURN count(u) as created_count
+    """
 
-        # Prepare user data
-        users_data = []
-        for user_id in batch:
-            username = f"fb{user_id}"
-            users_data.append({
-                "username": username,
-                "name": generate_random_name(),
-                "email": generate_email(user_id),
-                "password": hashed_password,
-                "bio": f"Imported Facebook user (ID: {user_id})",
-                "user_id": user_id  # Store the original Facebook ID for relationship mapping
-            })
+    results = import_batches_parallel(connection, query, "users", user_batches,
+                                      workers, "users", journal)
+
+    # Import profile features. Feature names are stored once on Feature nodes
+    # and each user only keeps the ids of the features set for them
+    # A user's features are the union over every network they appear in, so
+    # read all networks, not just the changed ones, or the SET below would
+    # replace the union with a partial set
+    print(f"Importing profile features with {workers} workers...")
+    feature_categories, user_features = load_features(all_edges_files)
+
+    feature_data = [
+        {"id": feature_id, "category": category}
+        for feature_id, category in sorted(feature_categories.items())
+    ]
+    feature_batches = [feature_data[i:i+batch_size] for i in range(0, len(feature_data), batch_size)]
+
+    query = """
+    UNWIND $features AS feature
+    MERGE (f:Feature {id: feature.id})
+    ON CREATE SET f.category = feature.category
+    RETURN count(f) as created_count
+    """
+
+    results += import_batches_parallel(connection, query, "features", feature_batches,
+                                       workers, "features", journal)
+
+    features_data = [
+        {"username": f"fb{user_id}", "features": user_features[user_id]}
+        for user_id in user_list if user_id in user_features
+    ]
+    user_feature_batches = [features_data[i:i+batch_size] for i in range(0, len(features_data), batch_size)]
+
+    # Only write users whose feature set changed, so re-imports stay write-free
+    query = """
+    UNWIND $users AS user
+    MATCH (u:User {username: user.username})
+    WHERE u.features IS NULL OR u.features <> user.features
+    SET u.features = user.features
+    RETURN count(u) as created_count
+    """
+
+    results += import_batches_parallel(connection, query, "users", user_feature_batches,
+                                       workers, "user features", journal)
+
+    # Import circles and their memberships
+    print(f"Importing circles with {workers} workers...")
+    circles, memberships = load_circles(edges_files)
+
+    circle_members = {}
+    for user_id, circle_id in memberships:
+        circle_members.setdefault(circle_id, []).append(f"fb{user_id}")
+    circle_data = [dict(circle, members=circle_members.get(circle["id"], [])) for circle in circles]
+    circle_batches = [circle_data[i:i+batch_size] for i in range(0, len(circle_data), batch_size)]
+
+    # A changed .circles file updates its circles in place: properties are
+    # rewritten when they differ and members it no longer lists are dropped
+    query = """
+    UNWIND $circles AS circle
+    MERGE (c:Circle {id: circle.id})
+    FOREACH (_ IN CASE WHEN c.size IS NULL OR c.size <> circle.size
+                            OR c.name <> circle.name OR c.owner <> circle.owner
+                       THEN [1] ELSE [] END |
+        SET c.name = circle.name,
+            c.owner = circle.owner,
+            c.size = circle.size
+    )
+    WITH c, circle
+    OPTIONAL MATCH (u:User)-[m:MEMBER_OF]->(c)
+    WHERE NOT u.username IN circle.members
+    DELETE m
+    RETURN count(DISTINCT c) as created_count
+    """
+
+    results += import_batches_parallel(connection, query, "circles", circle_batches,
+                                       workers, "circles", journal)
+
+    # Memberships are grouped by circle, so concurrent batches rarely lock the same Circle node
+    members_data = [
+        {"username": f"fb{user_id}", "circle": circle_id}
+        for user_id, circle_id in memberships
+    ]
+    member_batches = [members_data[i:i+batch_size] for i in range(0, len(members_data), batch_size)]
+
+    query = """
+    UNWIND $members AS member
+    MATCH (u:User {username: member.username})
+    MATCH (c:Circle {id: member.circle})
+    MERGE (u)-[m:MEMBER_OF]->(c)
+    RETURN count(m) as created_count
+    """
 
-        # Create users
-        query = """
-        UNWIND $users AS user
-        MERGE (u:User {username: user.username})
-        ON CREATE SET
-            u.name = user.name,
-            u.email = user.email,
-            u.password = user.password,
-            u.bio = user.bio,
-            u.joinDate = datetime(),
-            u.facebook_id = user.user_id
-        RETURN count(u) as created_count
-        """
-
-        result = connection.execute_query(query, {"users": users_data})
-        if result:
-            created = result[0]["created_count"]
-            print(f"Imported users batch {i//batch_size + 1}/{(len(user_list) + batch_size - 1)//batch_size}: {created} processed")
+    results += import_batches_parallel(connection, query, "members", member_batches,
+                                       workers, "circle memberships", journal)
 
     # Import relationships in batches
-    print("Importing relationships...")
-    for i in range(0, len(total_edges), batch_size):
-        batch = total_edges[i:i+batch_size]
+    print(f"Importing relationships with {workers} workers...")
+
+    # Drop pairs repeated across overlapping ego networks. The result is sorted
+    # by source, which keeps each batch on a contiguous range of source nodes so
+    # concurrent batches rarely contend for the same node locks
+    unique_edges = dedupe_edges(total_edges)
+    print(f"Sending {len(unique_edges)} unique connections "
+          f"({len(total_edges) - len(unique_edges)} duplicates dropped)")
+
+    rel_batches = []
+    for i in range(0, len(unique_edges), batch_size):
+        batch = unique_edges[i:i+batch_size]
 
         # Prepare relationship data
         rels_data = []
-        for source, target in batch:
+        for source, target in batch.tolist():
             rels_data.append({
                 "source": f"fb{source}",
                 "target": f"fb{target}"
             })
+        rel_batches.append(rels_data)
+
+    # Create relationships. Counters missing on users from an older graph
+    # are seeded from degree, which already includes the new edge
+    query = """
+    UNWIND $rels AS rel
+    MATCH (source:User {username: rel.source})
+    MATCH (target:User {username: rel.target})
+    MERGE (source)-[f:FOLLOWS]->(target)
+    ON CREATE SET
+        f.since = datetime(),
+        source.followingCount = coalesce(source.followingCount + 1, COUNT { (source)-[:FOLLOWS]->() }),
+        target.followerCount = coalesce(target.followerCount + 1, COUNT { (target)<-[:FOLLOWS]-() })
+    RETURN count(f) as created_count
+    """
 
-        # Create relationships
-        query = """
-        UNWIND $rels AS rel
-        MATCH (source:User {username: rel.source})
-        MATCH (target:User {username: rel.target})
-        MERGE (source)-[f:FOLLOWS {since: datetime()}]->(target)
-        RETURN count(f) as created_count
-        """
+    results += import_batches_parallel(connection, query, "rels", rel_batches,
+                                       workers, "relationships", journal)
 
-        result = connection.execute_query(query, {"rels": rels_data})
-        if result:
-            created = result[0]["created_count"]
-            print(f"Imported relationships batch {i//batch_size + 1}/{(len(total_edges) + batch_size - 1)//batch_size}: {created} processed")
+    failed = sum(stats["failed"] for stats in results)
+    if failed:
+        print(f"\nImport finished with {failed} failed batches.")
+        print("Run the importer again to retry them; committed batches will be skipped.")
+        connection.close()
+        return
+
+    journal.finish(file_digests)
 
     print("\nImport completed successfully!")
-    print(f"Imported {len(total_users)} users and {len(total_edges)} follows relationships")
-    print("\nDefault password for all imported users: 'password123'")
+    print(f"Imported {len(total_users)} users and {len(unique_edges)} follows relationships")
+    print(f"\nDefault password for all imported users: '{DEFAULT_PASSWORD}'")
     print("You can now log in to any imported user with username format 'fb<id>' (e.g., 'fb123')")
 
     # Close the connection
     connection.close()
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print(f"Usage: {sys.argv[0]} <dataset_directory>")
-        sys.exit(1)
-
-    dataset_dir = sys.argv[1]
-    if not os.path.isdir(dataset_dir):
-        print(f"Error: {dataset_dir} is not a valid directory")
+    parser = argparse.ArgumentParser(description="Import the Stanford Facebook dataset into Neo4j.")
+    parser.add_argument("dataset_dir", help="Directory containing the .edges files")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Concurrent sessions used for writes (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Rows per transaction (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--dedupe-existing", action="store_true",
+                        help="Remove duplicate FOLLOWS relationships left by earlier imports")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL,
+                        help=f"Progress journal used to resume imports (default: {DEFAULT_JOURNAL})")
+    parser.add_argument("--csv-out", metavar="DIR",
+                        help="Write neo4j-admin import CSVs to DIR instead of importing over Bolt")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dataset_dir):
+        print(f"Error: {args.dataset_dir} is not a valid directory")
         sys.exit(1)
 
-    import_facebook_data(dataset_dir)
+    if args.csv_out:
+        export_admin_csv(args.dataset_dir, args.csv_out)
+    else:
+        import_facebook_data(args.dataset_dir, workers=args.workers, batch_size=args.batch_size,
+                             dedupe_existing=args.dedupe_existing, journal_path=args.journal)
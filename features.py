@@ -0,0 +1,179 @@
+"""
+Profile similarity over the imported Facebook features.
+
+Each user's feature ids are packed into a row of 64-bit words, so comparing
+one user with many is a bitwise AND and a popcount per word. A MinHash
+locality-sensitive hashing (LSH) index narrows a query to users that share
+a bucket with it, so large user bases don't need a full scan.
+"""
+
+import heapq
+
+import numpy as np
+
+import dataimporter
+
+PROFILE_METRICS = ("cosine", "hamming")
+
+# MinHash LSH layout: a pair of users lands in a common bucket with
+# probability 1 - (1 - s^LSH_ROWS)^LSH_TABLES at Jaccard similarity s
+LSH_TABLES = 20
+LSH_ROWS = 3
+LSH_SEED = 7
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount_rows(words):
+    """Number of set bits in each row of a 2-D uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    # NumPy < 2.0 has no popcount ufunc; count bytes through a lookup table
+    return _POPCOUNT_TABLE[words.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+class FeatureIndex:
+    """
+    Packed feature bit-vectors for every user with profile features.
+
+    Build one with `from_neo4j` or `from_dataset`. Users without features
+    aren't indexed.
+    """
+
+    def __init__(self, usernames, names, feature_lists, source="memory"):
+        """
+        Args:
+            usernames: Username of each user
+            names: Display name of each user, or None when unknown
+            feature_lists: Feature ids set for each user, aligned with usernames
+            source: Where the features came from, for display
+        """
+        names = list(names) if names is not None else [None] * len(usernames)
+        kept = [i for i, ids in enumerate(feature_lists) if ids]
+        self.usernames = [usernames[i] for i in kept]
+        self.names = [names[i] for i in kept]
+        self.index = {username: i for i, username in enumerate(self.usernames)}
+        self.source = source
+
+        lengths = np.array([len(feature_lists[i]) for i in kept], dtype=np.int64)
+        flat = np.fromiter((feature_id for i in kept for feature_id in feature_lists[i]),
+                           dtype=np.int64, count=int(lengths.sum()))
+        self.feature_ids = np.unique(flat)
+        self._columns = np.searchsorted(self.feature_ids, flat)
+        self._indptr = np.zeros(len(kept) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self._indptr[1:])
+
+        # Set each feature's bit straight into its row's words, most
+        # significant bit first, without a dense users x features matrix
+        rows = np.repeat(np.arange(len(kept)), lengths)
+        self.words = np.zeros((len(kept), -(-len(self.feature_ids) // 64)), dtype=np.uint64)
+        np.bitwise_or.at(self.words, (rows, self._columns // 64),
+                         np.left_shift(np.uint64(1), (63 - self._columns % 64).astype(np.uint64)))
+        self.sizes = popcount_rows(self.words)
+
+        self._tables = None
+
+    @classmethod
+    def from_neo4j(cls, connection):
+        """Load the stored feature ids of every user; returns None if the query fails."""
+        result = connection.execute_query(
+            """
+            MATCH (u:User)
+            WHERE u.features IS NOT NULL
+            RETURN u.username AS username, u.name AS name, u.features AS features
+            """
+        )
+        if result is None:
+            return None
+
+        return cls([row["username"] for row in result], [row["name"] for row in result],
+                   [row["features"] for row in result], source="neo4j")
+
+    @classmethod
+    def from_dataset(cls, dataset_dir):
+        """
+        Load features straight from the .feat/.egofeat files, with usernames as
+        the importer assigns them. Returns None if the directory has no .edges files.
+        """
+        edges_files = dataimporter.list_edges_files(dataset_dir)
+        if not edges_files:
+            return None
+        _, user_features = dataimporter.load_features(edges_files)
+        user_ids = sorted(user_features)
+        return cls([f"fb{user_id}" for user_id in user_ids], None,
+                   [user_features[user_id] for user_id in user_ids], source=dataset_dir)
+
+    def __len__(self):
+        return len(self.usernames)
+
+    def similar(self, username, metric="cosine", limit=10, exact=False):
+        """
+        Rank users by how closely their profile features match `username`'s.
+
+        "cosine" scores |A & B| / sqrt(|A| |B|), best first; "hamming" counts
+        the features set for only one of the two, fewest first. Unless `exact`
+        is set, only users sharing an LSH bucket with the user are scored,
+        falling back to a full scan when that finds fewer than `limit`.
+
+        Returns:
+            Up to `limit` (username, name, score) tuples, or None if the user
+            has no indexed features
+        """
+        if metric not in PROFILE_METRICS:
+            raise ValueError(f"Unknown profile metric: {metric}")
+
+        me = self.index.get(username)
+        if me is None:
+            return None
+
+        candidates = None
+        if not exact:
+            candidates = self.candidates(me)
+            if len(candidates) <= limit:
+                candidates = None
+        if candidates is None:
+            candidates = np.arange(len(self))
+
+        common = popcount_rows(self.words[candidates] & self.words[me])
+        sizes = self.sizes[candidates]
+        if metric == "cosine":
+            scores = common / np.sqrt(sizes * self.sizes[me])
+            order_key = lambda k: (-scores[k], self.usernames[candidates[k]])
+        else:
+            scores = sizes + self.sizes[me] - 2 * common
+            order_key = lambda k: (scores[k], self.usernames[candidates[k]])
+
+        others = np.flatnonzero(candidates != me).tolist()
+        if metric == "cosine":
+            others = [k for k in others if scores[k] > 0]
+        best = heapq.nsmallest(limit, others, key=order_key)
+        return [(self.usernames[candidates[k]], self.names[candidates[k]], scores[k].item()) for k in best]
+
+    def candidates(self, position):
+        """Positions of every user sharing at least one LSH bucket with `position`."""
+        if self._tables is None:
+            self._tables = self._build_tables()
+
+        members = []
+        for buckets, order, starts in self._tables:
+            bucket = buckets[position]
+            members.append(order[starts[bucket]:starts[bucket + 1]])
+        return np.unique(np.concatenate(members))
+
+    def _build_tables(self):
+        """MinHash every user, then group users by signature band, one table per band."""
+        rng = np.random.default_rng(LSH_SEED)
+        # A random value per feature per hash; the minimum over a set behaves like a MinHash
+        values = rng.random((LSH_TABLES * LSH_ROWS, len(self.feature_ids)), dtype=np.float32)
+        signatures = np.minimum.reduceat(values[:, self._columns], self._indptr[:-1], axis=1).T
+
+        tables = []
+        for t in range(LSH_TABLES):
+            band = np.ascontiguousarray(signatures[:, t * LSH_ROWS:(t + 1) * LSH_ROWS])
+            _, buckets = np.unique(band, axis=0, return_inverse=True)
+            buckets = buckets.ravel()
+            order = np.argsort(buckets, kind="stable")
+            starts = np.zeros(buckets.max() + 2, dtype=np.int64)
+            np.cumsum(np.bincount(buckets), out=starts[1:])
+            tables.append((buckets, order, starts))
+        return tables
@@ -0,0 +1,112 @@
+"""
+Materialized leaderboard of the most followed users.
+
+The leaderboard caches the top users by follower count and keeps them
+current from this client's follow and unfollow events, so the popular
+command doesn't query the database on every call.
+"""
+
+import heapq
+import threading
+import time
+
+DEFAULT_SIZE = 10
+DEFAULT_MAX_STALENESS = 30.0
+
+# Users cached beyond the visible top K, so a few unfollows don't force a reload
+HEADROOM_FACTOR = 2
+
+
+class Leaderboard:
+    """
+    Caches the most followed users and updates them from follow events.
+
+    The cache holds more users than it shows. At the last refresh no user
+    outside the cache had more than `floor` followers, and follow events
+    move any user who climbs above it into the cache. So while the visible
+    top K stay at or above the floor, the ranking is exact for this client's
+    writes. Writes made by other clients show up at the next refresh, at
+    most `max_staleness` seconds later.
+    """
+
+    def __init__(self, connection, size=DEFAULT_SIZE, max_staleness=DEFAULT_MAX_STALENESS):
+        self.connection = connection
+        self.size = size
+        self.max_staleness = max_staleness
+        self._capacity = size * HEADROOM_FACTOR
+        self._entries = {}  # username -> (followers, name)
+        self._floor = 0
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def top(self):
+        """Return up to `size` (username, name, followers) tuples, most followed first, or None on error."""
+        with self._lock:
+            if self._needs_refresh() and not self._refresh():
+                return None
+            return [(username, name, followers) for username, (followers, name) in self._ranked()]
+
+    def record(self, username, name, followers):
+        """Apply a user's new follower count after a follow or unfollow."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+
+            if followers <= 0:
+                self._entries.pop(username, None)
+                return
+
+            if username in self._entries or followers > self._floor:
+                self._entries[username] = (followers, name)
+                self._trim()
+
+    def invalidate(self):
+        """Force a reload on the next read, e.g. after a change that affects many counts."""
+        with self._lock:
+            self._loaded_at = None
+
+    def _ranked(self):
+        """The visible top K entries, ties broken by username."""
+        return heapq.nsmallest(self.size, self._entries.items(),
+                               key=lambda item: (-item[1][0], item[0]))
+
+    def _needs_refresh(self):
+        if self._loaded_at is None:
+            return True
+        if time.monotonic() - self._loaded_at > self.max_staleness:
+            return True
+        if self._floor == 0:
+            # Every user with followers was cached at the last refresh
+            return False
+
+        # An uncached user may now outrank the visible entries
+        ranked = self._ranked()
+        return len(ranked) < self.size or ranked[-1][1][0] < self._floor
+
+    def _refresh(self):
+        result = self.connection.execute_query(
+            """
+            MATCH (u:User)
+            WHERE u.followerCount > 0
+            RETURN u.username AS username, u.name AS name, u.followerCount AS followers
+            ORDER BY u.followerCount DESC
+            LIMIT $limit
+            """,
+            {"limit": self._capacity}
+        )
+
+        if result is None:
+            return False
+
+        self._entries = {row["username"]: (row["followers"], row["name"]) for row in result}
+        self._floor = result[-1]["followers"] if len(result) == self._capacity else 0
+        self._loaded_at = time.monotonic()
+        return True
+
+    def _trim(self):
+        """Drop the lowest entries beyond capacity, raising the floor to match."""
+        while len(self._entries) > self._capacity:
+            username, (followers, _) = min(self._entries.items(),
+                                           key=lambda item: (item[1][0], item[0]))
+            del self._entries[username]
+            self._floor = max(self._floor, followers)
@@ -1,4 +1,9 @@
 import sys
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 
 try:
     from neo4j import GraphDatabase, exceptions as neo4j_exceptions
@@ -8,13 +13,247 @@ except ImportError:
     subprocess.check_call([sys.executable, "-m", "pip", "install", "neo4j"])
     from neo4j import GraphDatabase, exceptions as neo4j_exceptions
 
+DEFAULT_POOL_SIZE = 4
+DEFAULT_CACHE_SIZE = 256
+
+# Larger results are streamed through without being cached
+MAX_CACHED_ROWS = 5000
+
+
+class SessionPool:
+    """Keeps a bounded set of open driver sessions and reuses them across queries.
+
+    Sessions are handed out LIFO so the most recently used (and therefore
+    warm) session is picked first. A session that fails with a driver-level
+    error is discarded instead of being returned to the pool, and a caller
+    waiting on a full pool may open a replacement in its place.
+    """
+
+    def __init__(self, driver, size=DEFAULT_POOL_SIZE):
+        if size < 1:
+            raise ValueError("Session pool size must be at least 1")
+        self.driver = driver
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+        # Signalled whenever a session is returned or discarded
+        self._available = threading.Condition(self._lock)
+        self._open = 0
+        self._closed = False
+
+        # Acquisition metrics
+        self.acquisitions = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _acquire(self):
+        """Take an idle session, open a new one, or wait until either is possible."""
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Session pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                self._available.wait()
+
+        try:
+            return self.driver.session()
+        except Exception:
+            with self._available:
+                self._open -= 1
+                self._available.notify()
+            raise
+
+    def _release(self, session, healthy):
+        """Return a session to the pool, or close it if it can't be reused."""
+        with self._available:
+            reusable = healthy and not self._closed and not session.closed()
+            if reusable:
+                self._idle.append(session)
+            else:
+                self._open -= 1
+            self._available.notify()
+
+        if reusable:
+            return
+        try:
+            session.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def session(self):
+        """Check out a session for the duration of the ``with`` block."""
+        if self._closed:
+            raise RuntimeError("Session pool is closed")
+
+        start = time.perf_counter()
+        session = self._acquire()
+        wait = time.perf_counter() - start
+
+        with self._lock:
+            self.acquisitions += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+        healthy = True
+        try:
+            yield session
+        except neo4j_exceptions.DriverError:
+            # Connection-level failures leave the session in an unknown state
+            healthy = False
+            raise
+        finally:
+            self._release(session, healthy)
+
+    def stats(self):
+        """Return acquisition metrics for the pool."""
+        with self._lock:
+            avg_wait = self.total_wait / self.acquisitions if self.acquisitions else 0.0
+            return {
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "acquisitions": self.acquisitions,
+                "avg_wait_ms": avg_wait * 1000,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+    def close(self):
+        """Close every idle session; checked-out sessions close on release."""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            # Waiters wake up to find the pool closed
+            self._available.notify_all()
+
+        for session in idle:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+
+class QueryCache:
+    """
+    LRU cache of query results with a TTL per entry.
+
+    Entries can carry tags (such as "user:<username>") so a write only
+    invalidates the results it affects.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE, max_rows=MAX_CACHED_ROWS):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries = OrderedDict()  # key -> (expires_at, rows, tags)
+        self._tagged = {}  # tag -> keys of entries carrying it
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(query, parameters):
+        """Build the cache key for a query and its parameters."""
+        return query, json.dumps(parameters or {}, sort_keys=True, default=str)
+
+    def get(self, key):
+        """Return the cached rows for a key, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, rows, _ = entry
+            if time.monotonic() >= expires_at:
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rows
+
+    def put(self, key, rows, ttl, tags=()):
+        """Cache rows for `ttl` seconds, evicting the least recently used entries if full."""
+        if len(rows) > self.max_rows:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + ttl, rows, frozenset(tags))
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tags):
+        """Drop the entries carrying any of the tags, or every entry when no tags are given."""
+        with self._lock:
+            if not tags:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self._tagged.clear()
+                return
+
+            keys = set()
+            for tag in tags:
+                keys.update(self._tagged.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def stats(self):
+        """Return hit-rate and size metrics for the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
 class Neo4jConnection:
     """Handles connection and queries to Neo4j database."""
 
-    def __init__(self, uri, user, password):
+    def __init__(self, uri, user, password, pool_size=DEFAULT_POOL_SIZE,
+                 cache_size=DEFAULT_CACHE_SIZE):
         self.driver = None
+        self.pool = None
+        self.cache = QueryCache(cache_size)
         self.uri = uri
         self.user = user
+        self._connect(password, pool_size)
+
+    def _connect(self, password, pool_size):
+        """Open the driver and the session pool, reporting any failure; leaves driver None on error."""
+        uri = self.uri
+        user = self.user
         # Mask password for security in debug messages
         masked_pwd = '*' * len(password) if password else '(empty)'
 
@@ -28,6 +267,7 @@ class Neo4jConnection:
             # Test the connection
             with self.driver.session() as session:
                 session.run("RETURN 1")
+            self.pool = SessionPool(self.driver, pool_size)
             print("Connected to Neo4j database successfully!")
 
         # ServiceUnavailable errors
@@ -127,7 +367,9 @@ class Neo4jConnection:
             self.driver = None
 
     def close(self):
-        """Close the driver connection."""
+        """Close pooled sessions and the driver connection."""
+        if self.pool:
+            self.pool.close()
         if self.driver:
             self.driver.close()
 
@@ -135,41 +377,120 @@ class Neo4jConnection:
         """Verify if the connection to Neo4j is active."""
         return self.driver is not None
 
-    def execute_query(self, query, parameters=None):
-        """Execute a Cypher query and return results."""
+    def execute_query(self, query, parameters=None, ttl=None, tags=()):
+        """Execute a Cypher query and return results.
+
+        With a ``ttl``, results are served from the query cache for up to
+        that many seconds; ``tags`` name what the results depend on so
+        ``invalidate_cache`` can drop them after a write.
+        """
         if not self.driver:
             print("No connection to Neo4j database")
             return None
 
+        if ttl:
+            key = QueryCache.key(query, parameters)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         try:
-            with self.driver.session() as session:
+            with self.pool.session() as session:
                 result = session.run(query, parameters or {})
-                return [record for record in result]
-        except neo4j_exceptions.ClientError as e:
+                records = [record for record in result]
+        except Exception as e:
+            self._report_query_error(e)
+            return None
+
+        if ttl:
+            self.cache.put(key, records, ttl, tags)
+        return records
+
+    def stream_query(self, query, parameters=None, fetch_size=None, ttl=None, tags=()):
+        """Execute a Cypher query and yield records as they are fetched.
+
+        Records are pulled from the server in batches of ``fetch_size`` (the
+        pooled session default when omitted), and the next batch is only
+        requested once the caller has consumed the current one. A custom
+        ``fetch_size`` needs a dedicated session outside the pool, so keep it
+        for long exports rather than per-command reads. With a
+        ``ttl``, a result that is read to the end and fits the cache is
+        cached like in ``execute_query``.
+        """
+        if not self.driver:
+            print("No connection to Neo4j database")
+            return
+
+        if ttl:
+            key = QueryCache.key(query, parameters)
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield from cached
+                return
+
+        if fetch_size is None:
+            session_scope = self.pool.session()
+        else:
+            session_scope = self.driver.session(fetch_size=fetch_size)
+
+        try:
+            with session_scope as session:
+                result = session.run(query, parameters or {})
+                rows = [] if ttl else None
+                try:
+                    for record in result:
+                        if rows is not None:
+                            rows.append(record)
+                            if len(rows) > self.cache.max_rows:
+                                rows = None
+                        yield record
+                finally:
+                    # Discard rows the caller didn't read instead of buffering them
+                    result.consume()
+        except Exception as e:
+            self._report_query_error(e)
+            return
+
+        if rows is not None:
+            self.cache.put(key, rows, ttl, tags)
+
+    def invalidate_cache(self, *tags):
+        """Drop cached results carrying any of the tags, or all of them when no tags are given."""
+        self.cache.invalidate(*tags)
+
+    def stats(self):
+        """Return session pool metrics, or None when not connected."""
+        if not self.pool:
+            return None
+        return self.pool.stats()
+
+    def cache_stats(self):
+        """Return query cache metrics."""
+        return self.cache.stats()
+
+    def _report_query_error(self, e):
+        """Print a diagnostic banner for a failed query."""
+        if isinstance(e, neo4j_exceptions.ClientError):
             print(f"\n==== QUERY ERROR: CLIENT ERROR ====")
             print(f"Error: {str(e)}")
             print("Possible causes:")
             print("- Syntax error in Cypher query")
             print("- Constraint violation")
             print("===================================\n")
-            return None
-        except neo4j_exceptions.DatabaseError as e:
+        elif isinstance(e, neo4j_exceptions.DatabaseError):
             print(f"\n==== QUERY ERROR: DATABASE ERROR ====")
             print(f"Error: {str(e)}")
             print("Possible causes:")
             print("- Database encountered an error processing the query")
             print("=====================================\n")
-            return None
-        except neo4j_exceptions.TransientError as e:
+        elif isinstance(e, neo4j_exceptions.TransientError):
             print(f"\n==== QUERY ERROR: TRANSIENT ERROR ====")
             print(f"Error: {str(e)}")
             print("Possible causes:")
             print("- Database temporarily unavailable")
             print("- Try running the query again in a moment")
             print("=======================================\n")
-            return None
-        except Exception as e:
+        else:
             print(f"\n==== QUERY ERROR ====")
             print(f"Error executing query: {type(e).__name__}: {str(e)}")
             print("======================\n")
-            return None
@@ -0,0 +1,152 @@
+"""
+Precomputed "people you may know" recommendations.
+
+Candidates are friends of friends ranked by how many of the user's
+followed accounts lead to them. They are computed with a bounded
+expansion and stored as RECOMMENDED relationships, so showing
+recommendations is a single short read.
+"""
+
+import threading
+
+# Candidates stored per user
+DEFAULT_TOP_N = 20
+# Followed users expanded per computation
+DEFAULT_MAX_FOLLOWED = 200
+# Neighbours read from each followed user, so hubs can't blow up the expansion
+DEFAULT_FANOUT = 50
+# Seconds before stored candidates are recomputed on read
+DEFAULT_MAX_AGE = 3600
+# Seconds a read of the stored candidates stays in the query cache
+DEFAULT_CACHE_TTL = 120
+
+# Computes and stores the candidates for `me`. The candidate subquery and the
+# stale collect both aggregate, so `me` keeps its row even when there are no
+# candidates; the write subquery returns nothing, so it leaves that row alone.
+_STORE_CANDIDATES = """
+    CALL {
+        WITH me
+        MATCH (me)-[:FOLLOWS]->(x:User)
+        WITH me, x LIMIT $max_followed
+        CALL {
+            WITH me, x
+            MATCH (x)-[:FOLLOWS]->(rec:User)
+            WHERE rec <> me AND NOT (me)-[:FOLLOWS]->(rec)
+            RETURN rec LIMIT $fanout
+        }
+        WITH rec, count(*) AS score
+        ORDER BY score DESC, rec.username
+        LIMIT $top_n
+        RETURN collect({user: rec, score: score}) AS candidates
+    }
+    OPTIONAL MATCH (me)-[old:RECOMMENDED]->()
+    WITH me, candidates, collect(old) AS stale
+    FOREACH (r IN stale | DELETE r)
+    CALL {
+        WITH me, candidates
+        UNWIND candidates AS c
+        WITH me, c.user AS rec, c.score AS score
+        CREATE (me)-[:RECOMMENDED {score: score}]->(rec)
+    }
+    SET me.recommendationsAt = datetime()
+"""
+
+
+class RecommendationEngine:
+    """
+    Stores the top friend-of-friend candidates per user and serves them.
+
+    Stored candidates are recomputed when they are older than `max_age`, or
+    when this client has seen the user follow or unfollow someone since.
+    Users followed after the computation are filtered out at read time.
+    Reads go through the connection's query cache for `cache_ttl` seconds,
+    tagged with the user so follow writes invalidate them.
+    """
+
+    def __init__(self, connection, top_n=DEFAULT_TOP_N, max_followed=DEFAULT_MAX_FOLLOWED,
+                 fanout=DEFAULT_FANOUT, max_age=DEFAULT_MAX_AGE, cache_ttl=DEFAULT_CACHE_TTL):
+        self.connection = connection
+        self.top_n = top_n
+        self.max_followed = max_followed
+        self.fanout = fanout
+        self.max_age = max_age
+        self.cache_ttl = cache_ttl
+        self._stale = set()
+        self._lock = threading.Lock()
+
+    def _limits(self):
+        return {"top_n": self.top_n, "max_followed": self.max_followed, "fanout": self.fanout}
+
+    def get(self, username, limit=5):
+        """Return up to `limit` recommendation dicts (username, name, score), or None on error."""
+        with self._lock:
+            stale = username in self._stale
+
+        if not stale:
+            result = self._read(username, limit)
+            if result is None:
+                return None
+            if not result:
+                return []
+            stale = result[0]["stale"]
+
+        if stale:
+            if self.refresh(username) is None:
+                return None
+            result = self._read(username, limit)
+            if not result:
+                return None if result is None else []
+
+        return result[0]["recs"]
+
+    def refresh(self, username):
+        """Recompute and store one user's candidates; returns how many were stored, or None on error."""
+        result = self.connection.execute_query(
+            "MATCH (me:User {username: $me})" + _STORE_CANDIDATES + "RETURN size(candidates) AS stored",
+            dict(self._limits(), me=username)
+        )
+        if result is None:
+            return None
+
+        with self._lock:
+            self._stale.discard(username)
+        self.connection.invalidate_cache(f"user:{username}")
+        return result[0]["stored"] if result else 0
+
+    def refresh_all(self, batch_size=500):
+        """Recompute candidates for every user in batched transactions; returns False on error."""
+        result = self.connection.execute_query(
+            "MATCH (me:User) CALL { WITH me" + _STORE_CANDIDATES
+            + "} IN TRANSACTIONS OF $batch_size ROWS",
+            dict(self._limits(), batch_size=batch_size)
+        )
+        if result is None:
+            return False
+
+        with self._lock:
+            self._stale.clear()
+        self.connection.invalidate_cache()
+        return True
+
+    def mark_stale(self, username):
+        """Note that a user followed or unfollowed someone, so their candidates are recomputed on next read."""
+        with self._lock:
+            self._stale.add(username)
+
+    def _read(self, username, limit):
+        return self.connection.execute_query(
+            """
+            MATCH (me:User {username: $me})
+            OPTIONAL MATCH (me)-[r:RECOMMENDED]->(rec:User)
+            WHERE NOT (me)-[:FOLLOWS]->(rec)
+            WITH me, r, rec ORDER BY r.score DESC, rec.username
+            WITH me, collect(CASE WHEN rec IS NULL THEN null
+                                  ELSE {username: rec.username, name: rec.name, score: r.score} END) AS recs
+            RETURN recs[..$limit] AS recs,
+                   me.recommendationsAt IS NULL
+                   OR me.recommendationsAt < datetime() - duration({seconds: $max_age}) AS stale
+            """,
+            {"me": username, "limit": limit, "max_age": self.max_age},
+            ttl=self.cache_ttl,
+            tags=(f"user:{username}",)
+        )
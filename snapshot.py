@@ -0,0 +1,369 @@
+"""
+In-process snapshot of the FOLLOWS graph.
+
+The snapshot holds the graph as compressed sparse row (CSR) adjacency in
+NumPy arrays: user i follows out_indices[out_indptr[i]:out_indptr[i + 1]],
+sorted ascending, and is followed by the matching slice of in_indices.
+Graph questions answered from it never leave the process, at the cost of
+reflecting the graph as it was when the snapshot was taken.
+"""
+
+import heapq
+import time
+
+import numpy as np
+
+import dataimporter
+
+# Node positions fit comfortably in 32 bits; edge offsets may not
+INDEX_DTYPE = np.int32
+OFFSET_DTYPE = np.int64
+
+SIMILARITY_METRICS = ("jaccard", "adamic-adar")
+
+# Path search budgets: hops in the path, and adjacency entries scanned in total
+DEFAULT_MAX_DEPTH = 6
+DEFAULT_MAX_EXPANSIONS = 200_000
+
+
+def gather_rows(indptr, indices, rows):
+    """Concatenate the CSR rows `rows` into one array without a Python loop."""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=indices.dtype)
+
+    # Position j of row k sits at starts[k] + j; shift a running arange by each row's start
+    shifts = starts - (np.cumsum(lengths) - lengths)
+    return indices[np.repeat(shifts, lengths) + np.arange(total)]
+
+
+def count_common(reference, indptr, indices):
+    """
+    Count, for every CSR row, the entries that also appear in `reference`.
+
+    `reference` must be sorted and unique. Every entry is looked up with one
+    vectorized binary search, so counting many rows costs a single pass over
+    their combined entries.
+    """
+    row_count = len(indptr) - 1
+    if len(reference) == 0 or len(indices) == 0:
+        return np.zeros(row_count, dtype=np.int64)
+
+    slots = np.minimum(np.searchsorted(reference, indices), len(reference) - 1)
+    hits = reference[slots] == indices
+    rows = np.repeat(np.arange(row_count), np.diff(indptr))
+    return np.bincount(rows[hits], minlength=row_count)
+
+
+def mutual_counts_from_lists(following, others):
+    """
+    Count how many of `following` each list in `others` also contains.
+
+    Usernames are encoded as integers once, so the intersections run over
+    sorted int arrays instead of Python sets.
+    """
+    lengths = np.fromiter((len(names) for names in others), dtype=np.int64, count=len(others))
+    flat = [username for names in others for username in names]
+    _, encoded = np.unique(np.array(list(following) + flat, dtype=object), return_inverse=True)
+    encoded = encoded.ravel()
+
+    reference = np.unique(encoded[:len(following)])
+    indptr = np.zeros(len(others) + 1, dtype=OFFSET_DTYPE)
+    np.cumsum(lengths, out=indptr[1:])
+    return count_common(reference, indptr, encoded[len(following):])
+
+
+def _build_csr(rows, cols, size):
+    """Return (indptr, indices) for the edges rows[i] -> cols[i], each row sorted."""
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(size + 1, dtype=OFFSET_DTYPE)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr, cols[order].astype(INDEX_DTYPE)
+
+
+class GraphSnapshot:
+    """
+    Read-only CSR adjacency of the FOLLOWS graph.
+
+    Build one with `from_neo4j` or `from_dataset`. Duplicate edges and
+    self-follows are dropped.
+    """
+
+    def __init__(self, usernames, names, sources, targets, source="memory"):
+        """
+        Args:
+            usernames: Username of each node position
+            names: Display name of each node position, or None when unknown
+            sources: Node positions of the following users
+            targets: Node positions of the followed users, aligned with sources
+            source: Where the snapshot came from, for display
+        """
+        self.usernames = list(usernames)
+        self.names = list(names) if names is not None else [None] * len(self.usernames)
+        self.index = {username: i for i, username in enumerate(self.usernames)}
+        self.source = source
+        self.built_at = time.time()
+
+        size = len(self.usernames)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+
+        # One key per edge, so duplicates collapse in a single unique pass
+        keys = np.unique(sources * size + targets)
+        sources, targets = keys // size, keys % size
+        keep = sources != targets
+        sources, targets = sources[keep], targets[keep]
+
+        self.out_indptr, self.out_indices = _build_csr(sources, targets, size)
+        self.in_indptr, self.in_indices = _build_csr(targets, sources, size)
+
+    @classmethod
+    def from_neo4j(cls, connection):
+        """Export the graph from Neo4j in one pass; returns None if the query fails."""
+        result = connection.execute_query(
+            """
+            MATCH (u:User)
+            RETURN u.username AS username, u.name AS name,
+                   [(u)-[:FOLLOWS]->(v:User) | v.username] AS following
+            """
+        )
+        if result is None:
+            return None
+
+        usernames = [row["username"] for row in result]
+        names = [row["name"] for row in result]
+        index = {username: i for i, username in enumerate(usernames)}
+
+        counts = np.fromiter((len(row["following"]) for row in result), dtype=np.int64, count=len(result))
+        sources = np.repeat(np.arange(len(result), dtype=np.int64), counts)
+        targets = np.fromiter((index[username] for row in result for username in row["following"]),
+                              dtype=np.int64, count=int(counts.sum()))
+
+        return cls(usernames, names, sources, targets, source="neo4j")
+
+    @classmethod
+    def from_dataset(cls, dataset_dir):
+        """
+        Build the graph straight from the .edges files, with usernames as the
+        importer assigns them. Returns None if the directory has no .edges files.
+        """
+        edges_files = dataimporter.list_edges_files(dataset_dir)
+        if not edges_files:
+            return None
+        user_ids, edges = dataimporter.load_network(edges_files, verbose=False)
+        positions = np.searchsorted(user_ids, edges)
+        usernames = [f"fb{user_id}" for user_id in user_ids.tolist()]
+        return cls(usernames, None, positions[:, 0], positions[:, 1], source=dataset_dir)
+
+    def __len__(self):
+        return len(self.usernames)
+
+    @property
+    def edge_count(self):
+        return len(self.out_indices)
+
+    def position(self, username):
+        """Node position of a username, or None if it isn't in the snapshot."""
+        return self.index.get(username)
+
+    def following(self, position):
+        """Sorted node positions the user at `position` follows."""
+        return self.out_indices[self.out_indptr[position]:self.out_indptr[position + 1]]
+
+    def followers(self, position):
+        """Sorted node positions following the user at `position`."""
+        return self.in_indices[self.in_indptr[position]:self.in_indptr[position + 1]]
+
+    def follower_counts(self):
+        """Follower count of every node position."""
+        return np.diff(self.in_indptr)
+
+    def mutuals(self, username, other):
+        """Usernames followed by both users, sorted, or None if either is unknown."""
+        a, b = self.position(username), self.position(other)
+        if a is None or b is None:
+            return None
+        common = np.intersect1d(self.following(a), self.following(b), assume_unique=True)
+        return sorted(self.usernames[i] for i in common.tolist())
+
+    def mutual_counts(self, username, others=None):
+        """
+        Count the users followed by both `username` and each of `others`.
+
+        Returns:
+            Counts aligned with `others`, or with node positions when `others`
+            is None; None if `username` is unknown. Unknown names in `others`
+            count zero.
+        """
+        me = self.position(username)
+        if me is None:
+            return None
+
+        followed = self.following(me)
+        if others is None:
+            # Everyone following any of my followed users, once per shared account
+            return np.bincount(gather_rows(self.in_indptr, self.in_indices, followed), minlength=len(self))
+
+        positions = [self.position(other) for other in others]
+        known = np.array([i for i in positions if i is not None], dtype=np.int64)
+        counts = np.zeros(len(others), dtype=np.int64)
+        if len(known):
+            starts = self.out_indptr[known]
+            lengths = self.out_indptr[known + 1] - starts
+            indptr = np.zeros(len(known) + 1, dtype=OFFSET_DTYPE)
+            np.cumsum(lengths, out=indptr[1:])
+            found = np.array([i is not None for i in positions])
+            counts[found] = count_common(followed, indptr, gather_rows(self.out_indptr, self.out_indices, known))
+        return counts
+
+    def top_mutuals(self, username, limit=10):
+        """Up to `limit` (username, name, mutuals) tuples for the users sharing the most follows, or None."""
+        counts = self.mutual_counts(username)
+        if counts is None:
+            return None
+        counts[self.position(username)] = 0
+        return self._top(counts, limit)
+
+    def similar(self, username, metric="jaccard", limit=10):
+        """
+        Rank users by how much the accounts they follow overlap with `username`'s.
+
+        Overlaps with every user come from one sparse product: each account
+        the user follows contributes to all of its followers. "jaccard" is
+        |A & B| / |A | B|; "adamic-adar" sums 1 / log(followers) over shared
+        accounts, so sharing a niche account counts for more than sharing a
+        hub.
+
+        Returns:
+            Up to `limit` (username, name, score) tuples, best first, or None
+            if the user is unknown
+        """
+        if metric not in SIMILARITY_METRICS:
+            raise ValueError(f"Unknown similarity metric: {metric}")
+
+        me = self.position(username)
+        if me is None:
+            return None
+
+        followed = self.following(me)
+        sharers = gather_rows(self.in_indptr, self.in_indices, followed)
+        if metric == "jaccard":
+            common = np.bincount(sharers, minlength=len(self))
+            out_degrees = np.diff(self.out_indptr)
+            union = len(followed) + out_degrees - common
+            scores = np.divide(common, union, out=np.zeros(len(self)), where=union > 0)
+        else:
+            degrees = self.follower_counts()[followed]
+            # An account only I follow is shared with nobody, so its weight never lands
+            weights = 1.0 / np.log(np.maximum(degrees, 2))
+            scores = np.bincount(sharers, weights=np.repeat(weights, degrees), minlength=len(self))
+
+        scores[me] = 0
+        candidates = np.flatnonzero(scores > 0).tolist()
+        best = heapq.nsmallest(limit, candidates, key=lambda i: (-scores[i], self.usernames[i]))
+        return [(self.usernames[i], self.names[i], float(scores[i])) for i in best]
+
+    def shortest_path(self, username, other, max_depth=DEFAULT_MAX_DEPTH,
+                      max_expansions=DEFAULT_MAX_EXPANSIONS):
+        """
+        Find a shortest chain of follows from `username` to `other`.
+
+        Searches forward along follows from one end and backward along
+        followers from the other, one whole level at a time, always
+        expanding the side whose next level has fewer adjacency entries.
+        Hubs therefore get reached from the cheaper side, and the search
+        stops once the next level would scan more than `max_expansions`
+        entries in total.
+
+        Returns:
+            A tuple (path, exhausted): path is the list of usernames, or None
+            if no path of at most `max_depth` hops was found; exhausted is
+            True if the search stopped on the expansion budget. Raises
+            KeyError if either user is unknown.
+        """
+        source, target = self.index[username], self.index[other]
+        if source == target:
+            return [username], False
+
+        # parents[side][v] is the node v was reached from, -1 if unvisited
+        parents = [np.full(len(self), -1, dtype=np.int64), np.full(len(self), -1, dtype=np.int64)]
+        parents[0][source] = source
+        parents[1][target] = target
+        frontiers = [np.array([source]), np.array([target])]
+        adjacency = [(self.out_indptr, self.out_indices), (self.in_indptr, self.in_indices)]
+        scanned = 0
+
+        for _ in range(max_depth):
+            costs = [int((indptr[frontier + 1] - indptr[frontier]).sum())
+                     for frontier, (indptr, _) in zip(frontiers, adjacency)]
+            side = 0 if costs[0] <= costs[1] else 1
+            if scanned + costs[side] > max_expansions:
+                return None, True
+            scanned += costs[side]
+
+            indptr, indices = adjacency[side]
+            frontier = frontiers[side]
+            reached = gather_rows(indptr, indices, frontier)
+            via = np.repeat(frontier, indptr[frontier + 1] - indptr[frontier])
+
+            new = parents[side][reached] < 0
+            reached, first = np.unique(reached[new], return_index=True)
+            parents[side][reached] = via[new][first]
+
+            met = reached[parents[1 - side][reached] >= 0]
+            if len(met):
+                return self._join_path(parents, int(met[0])), False
+            if len(reached) == 0:
+                return None, False
+            frontiers[side] = reached
+
+        return None, False
+
+    def _join_path(self, parents, meeting):
+        """Usernames from the source to the target through the node both searches reached."""
+        forward = [meeting]
+        while parents[0][forward[-1]] != forward[-1]:
+            forward.append(int(parents[0][forward[-1]]))
+        backward = []
+        node = meeting
+        while parents[1][node] != node:
+            node = int(parents[1][node])
+            backward.append(node)
+        return [self.usernames[i] for i in forward[::-1] + backward]
+
+    def recommendations(self, username, limit=5):
+        """
+        Friends of friends the user doesn't follow yet, ranked like the
+        recommendations command.
+
+        Returns:
+            Up to `limit` (username, name, mutuals) tuples, or None if the
+            user is unknown
+        """
+        me = self.position(username)
+        if me is None:
+            return None
+
+        followed = self.following(me)
+        counts = np.bincount(gather_rows(self.out_indptr, self.out_indices, followed),
+                             minlength=len(self))
+        counts[me] = 0
+        counts[followed] = 0
+        return self._top(counts, limit)
+
+    def popular(self, limit=10):
+        """Up to `limit` (username, name, followers) tuples, most followed first."""
+        return self._top(self.follower_counts(), limit)
+
+    def _top(self, scores, limit):
+        """The `limit` highest positive scores, ties broken by username."""
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            # Keep every candidate tied with the cut-off so the username tie-break is exact
+            cutoff = np.partition(scores[candidates], len(candidates) - limit)[len(candidates) - limit]
+            candidates = candidates[scores[candidates] >= cutoff]
+
+        ranked = sorted(candidates.tolist(), key=lambda i: (-scores[i], self.usernames[i]))[:limit]
+        return [(self.usernames[i], self.names[i], int(scores[i])) for i in ranked]